@@ -12,11 +12,15 @@ This script does EVERYTHING:
 
 import os
 import json
+import mmap
+import zlib
 import zipfile
 import shutil
 import hashlib
+import functools
 import subprocess
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # ==================== CONFIGURATION ====================
 VERSION = "1.0.0"
@@ -24,29 +28,72 @@ BASE_DIR = Path(__file__).parent
 BSP_SOURCE = BASE_DIR / "arduino-esp32-master"
 OUTPUT_ZIP = BASE_DIR / f"nuttyfi32-{VERSION}.zip"
 JSON_FILE = BASE_DIR / "package_nuttyfi32_index.json"
+ZIP_SHA256_CACHE = BASE_DIR / ".zip_sha256.json"  # {zip_mtime_ns, zip_size, sha256} of OUTPUT_ZIP
+LAST_PUSH_FILE = BASE_DIR / ".last_push"  # BSP hash, JSON hash and HEAD of the last successful push
 GITHUB_BRANCH = "Master"
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB read buffer for hashing
+ZIP_WRITE_BUFFER = 1024 * 1024  # 1 MiB write buffer for OUTPUT_ZIP (default is 8 KiB)
+ZIP_MMAP_THRESHOLD = 64 * 1024  # DEFLATE files this big straight from an mmap instead of read()
+ZIP_COMPRESSLEVEL = 1  # zlib level 1: several times faster than default 6, slightly larger ZIP
+FAST_ZIP = False  # True = ZIP_STORED (no compression) for quick local test builds
+BSP_HASH_CONTENTS = False  # True = change detection hashes file contents, not just mtime/size
+# Already compressed / incompressible files are stored as-is instead of DEFLATEd
+STORED_EXTENSIONS = {'.zip', '.gz', '.xz', '.7z', '.bz2', '.tar', '.jar', '.png', '.jpg', '.jpeg',
+                     '.ico', '.pdf', '.bin', '.elf', '.exe', '.dll', '.so', '.dylib'}
 # =======================================================
 
+# (hash, file_info) of BSP_SOURCE, filled on first use by get_bsp_snapshot()
+_bsp_snapshot = None
+
 def calculate_sha256(file_path):
     """Calculate SHA-256 checksum"""
     sha256_hash = hashlib.sha256()
+    # Reuse one 1 MiB buffer instead of allocating a new 4 KiB block per read
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
     return sha256_hash.hexdigest().upper()
 
 def get_file_size(file_path):
     """Get file size in bytes"""
     return os.path.getsize(file_path)
 
+def get_zip_checksum():
+    """Return (sha256, size) of OUTPUT_ZIP, reusing the cached hash if the ZIP is unchanged"""
+    st = OUTPUT_ZIP.stat()
+    if ZIP_SHA256_CACHE.exists():
+        try:
+            with open(ZIP_SHA256_CACHE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache["zip_mtime_ns"] == st.st_mtime_ns and cache["zip_size"] == st.st_size:
+                return cache["sha256"], st.st_size
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    checksum = calculate_sha256(OUTPUT_ZIP)
+    save_zip_checksum(checksum)
+    return checksum, st.st_size
+
+def save_zip_checksum(checksum):
+    """Record the SHA-256 of OUTPUT_ZIP against its current mtime and size"""
+    st = OUTPUT_ZIP.stat()
+    with open(ZIP_SHA256_CACHE, 'w', encoding='utf-8') as f:
+        json.dump({"zip_mtime_ns": st.st_mtime_ns, "zip_size": st.st_size, "sha256": checksum}, f)
+
+@functools.lru_cache(maxsize=1)
 def get_token():
-    """Get token from .github_token file"""
+    """Get token from .github_token file (read once per run)"""
     config_file = BASE_DIR / ".github_token"
     if config_file.exists():
         try:
             with open(config_file, 'r') as f:
                 return f.read().strip()
-        except:
+        except OSError:
             pass
     return None
 
@@ -58,31 +105,70 @@ def print_task_status(task_num, total, task_name, status, details=""):
     if details:
         print(f"  └─ {details}")
 
+def scan_bsp_files(path):
+    """Yield os.DirEntry for every non-hidden file under path (like os.walk)"""
+    with os.scandir(path) as it:
+        for entry in it:
+            # Skip hidden files and folders
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    yield from scan_bsp_files(entry.path)
+            else:
+                yield entry
+
+def hash_file_contents(file_path):
+    """BLAKE2b digest of a file's contents (runs in a worker thread)"""
+    hasher = hashlib.blake2b(digest_size=32)
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    with open(file_path, "rb") as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
 def calculate_bsp_hash():
-    """Calculate hash of BSP source folder to detect changes"""
-    hasher = hashlib.sha256()
-    
-    # Get all files and their modification times
+    """Calculate hash of BSP source folder, returns (hash, file_info)"""
+    # Local change detection only - BLAKE2b is faster than SHA-256 and needs no extra package.
+    # The Arduino JSON checksum still uses calculate_sha256().
+    hasher = hashlib.blake2b(digest_size=32)
+    # Plain string slicing instead of Path.relative_to() per file
+    source_prefix = str(BSP_SOURCE) + os.sep
+    prefix_len = len(source_prefix)
+    
+    # Get all files and their modification times (DirEntry caches the stat)
     file_info = []
-    for root, dirs, files in os.walk(BSP_SOURCE):
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-        files = [f for f in files if not f.startswith('.')]
-        
-        for file in files:
-            file_path = Path(root) / file
-            rel_path = file_path.relative_to(BSP_SOURCE)
-            mtime = file_path.stat().st_mtime
-            size = file_path.stat().st_size
-            file_info.append((str(rel_path), mtime, size))
+    for entry in scan_bsp_files(str(BSP_SOURCE)):
+        st = entry.stat()
+        file_info.append((entry.path[prefix_len:], st.st_mtime, st.st_size))
     
     # Sort for consistent hashing
     file_info.sort()
     
     # Create hash from file info
-    for path, mtime, size in file_info:
-        hasher.update(f"{path}:{mtime}:{size}".encode())
+    if BSP_HASH_CONTENTS:
+        # hashlib releases the GIL on large buffers, so threads hash files in parallel
+        paths = [source_prefix + path for path, _, _ in file_info]
+        with ThreadPoolExecutor() as executor:
+            digests = executor.map(hash_file_contents, paths)
+            for (path, _, size), digest in zip(file_info, digests):
+                hasher.update(f"{path}:{digest}:{size}".encode())
+    else:
+        for path, mtime, size in file_info:
+            hasher.update(f"{path}:{mtime}:{size}".encode())
     
-    return hasher.hexdigest()
+    return hasher.hexdigest(), file_info
+
+def get_bsp_snapshot():
+    """Return cached (hash, file_info) so the BSP tree is walked once per run"""
+    global _bsp_snapshot
+    if _bsp_snapshot is None:
+        _bsp_snapshot = calculate_bsp_hash()
+    return _bsp_snapshot
 
 def check_if_zip_needs_update():
     """Check if ZIP file needs to be updated based on BSP changes"""
@@ -91,7 +177,7 @@ def check_if_zip_needs_update():
         return True
     
     # Calculate current BSP hash
-    current_hash = calculate_bsp_hash()
+    current_hash, _ = get_bsp_snapshot()
     
     # Check if we have a stored hash
     hash_file = BASE_DIR / ".zip_hash"
@@ -113,9 +199,15 @@ def check_if_zip_needs_update():
     print("  ℹ️  No previous hash found - will create/update ZIP")
     return True
 
+def list_zips(prefix):
+    """List <prefix>*.zip files in BASE_DIR with one scandir pass (no fnmatch per entry)"""
+    with os.scandir(BASE_DIR) as it:
+        return [Path(entry.path) for entry in it
+                if entry.name.startswith(prefix) and entry.name.endswith('.zip') and entry.is_file()]
+
 def clean_old_zips():
     """Delete all old nuttyfi32-*.zip files"""
-    old_zips = list(BASE_DIR.glob("nuttyfi32-*.zip"))
+    old_zips = list_zips("nuttyfi32-")
     deleted_count = 0
     for old_zip in old_zips:
         if old_zip != OUTPUT_ZIP:  # Don't delete the one we're about to create
@@ -123,6 +215,64 @@ def clean_old_zips():
             deleted_count += 1
     return deleted_count
 
+class HashingFile:
+    """Write-only file wrapper that SHA-256 hashes bytes as they are written"""
+    
+    def __init__(self, fp):
+        self._fp = fp
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+    
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self._fp.write(data)
+    
+    def tell(self):
+        return self.size
+    
+    def flush(self):
+        self._fp.flush()
+
+def deflate(data, compresslevel):
+    """Raw DEFLATE stream of data, as stored in a ZIP member"""
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+def compress_zip_entry(task):
+    """Read and compress one file (runs in a worker process)"""
+    file_path, arcname, compress_type, compresslevel = task
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    zinfo.compress_type = compress_type
+    with open(file_path, "rb") as f:
+        if compress_type == zipfile.ZIP_DEFLATED and zinfo.file_size >= ZIP_MMAP_THRESHOLD:
+            # zlib reads the page cache directly, no copy into a Python bytes object
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                compressed = deflate(data, compresslevel)
+                zinfo.file_size = len(data)
+                zinfo.CRC = zlib.crc32(data)
+            zinfo.compress_size = len(compressed)
+            return zinfo, compressed
+        data = f.read()
+    if compress_type == zipfile.ZIP_DEFLATED:
+        compressed = deflate(data, compresslevel)
+    else:
+        compressed = data
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    zinfo.compress_size = len(compressed)
+    return zinfo, compressed
+
+def write_compressed_entry(zipf, zinfo, compressed):
+    """Append an already-compressed member to an open ZipFile"""
+    zinfo.header_offset = zipf.fp.tell()
+    zipf.fp.write(zinfo.FileHeader())
+    zipf.fp.write(compressed)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    # Central directory is written at start_dir when the ZipFile closes
+    zipf.start_dir = zipf.fp.tell()
+
 def create_zip_from_bsp():
     """Create ZIP file from arduino-esp32-master folder"""
     if not BSP_SOURCE.exists():
@@ -136,23 +286,37 @@ def create_zip_from_bsp():
         OUTPUT_ZIP.unlink()
         print("  ✓ Deleted old ZIP file")
     
-    # Create ZIP with files at root level
+    # Reuse the file list from the change check instead of walking again
+    current_hash, file_info = get_bsp_snapshot()
+    
+    compression = zipfile.ZIP_STORED if FAST_ZIP else zipfile.ZIP_DEFLATED
+    
+    # Create ZIP with files at root level; DEFLATE runs on all CPU cores and
+    # the main process only appends the compressed members in order
+    source_prefix = str(BSP_SOURCE) + os.sep
+    tasks = []
+    for rel_path, _, _ in file_info:
+        if os.path.splitext(rel_path)[1].lower() in STORED_EXTENSIONS:
+            compress_type = zipfile.ZIP_STORED
+        else:
+            compress_type = compression
+        tasks.append((source_prefix + rel_path, rel_path, compress_type, ZIP_COMPRESSLEVEL))
     file_count = 0
-    with zipfile.ZipFile(OUTPUT_ZIP, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(BSP_SOURCE):
-            # Skip hidden files and folders
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            files = [f for f in files if not f.startswith('.')]
-            
-            for file in files:
-                file_path = Path(root) / file
-                # Get relative path from BSP_SOURCE
-                arcname = file_path.relative_to(BSP_SOURCE)
-                zipf.write(file_path, arcname)
-                file_count += 1
+    # HashingFile has no seek(), so zipfile writes strictly sequentially and
+    # the SHA-256 of the archive is ready without reading it back. Headers and
+    # members are many small writes, so batch them through a large buffer
+    with open(OUTPUT_ZIP, 'wb', buffering=ZIP_WRITE_BUFFER) as raw:
+        out = HashingFile(raw)
+        with zipfile.ZipFile(out, 'w', compression, compresslevel=ZIP_COMPRESSLEVEL) as zipf:
+            with ProcessPoolExecutor() as executor:
+                for zinfo, compressed in executor.map(compress_zip_entry, tasks, chunksize=16):
+                    write_compressed_entry(zipf, zinfo, compressed)
+                    file_count += 1
+    
+    # Replace the cached checksum with the one streamed during the write
+    save_zip_checksum(out.sha256.hexdigest().upper())
     
     # Save hash for future comparison
-    current_hash = calculate_bsp_hash()
     hash_file = BASE_DIR / ".zip_hash"
     with open(hash_file, 'w') as f:
         f.write(current_hash)
@@ -164,13 +328,13 @@ def update_json_with_zip_info():
     if not OUTPUT_ZIP.exists():
         raise FileNotFoundError(f"ZIP file not found: {OUTPUT_ZIP}")
     
-    # Calculate checksum and size
-    checksum = calculate_sha256(OUTPUT_ZIP)
-    size = str(get_file_size(OUTPUT_ZIP))
+    # Calculate checksum and size (cached while the ZIP is unchanged)
+    checksum, size = get_zip_checksum()
+    size = str(size)
     
     # Read JSON
-    with open(JSON_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    original = JSON_FILE.read_text(encoding='utf-8')
+    data = json.loads(original)
     
     # Update platform info
     platform = data['packages'][0]['platforms'][0]
@@ -180,12 +344,98 @@ def update_json_with_zip_info():
     platform['checksum'] = f"SHA-256:{checksum}"
     platform['size'] = size
     
-    # Write JSON
-    with open(JSON_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    # Write JSON - serialize once (json.dump writes every token separately)
+    # and leave the file untouched when nothing changed
+    content = json.dumps(data, indent=2)
+    if content != original:
+        # Temp file + os.replace: a crash mid-write cannot lose the index, and
+        # a hardlink left by an older sync is replaced, not written through
+        tmp_json = JSON_FILE.with_name(JSON_FILE.name + ".tmp")
+        tmp_json.write_text(content, encoding='utf-8')
+        os.replace(tmp_json, JSON_FILE)
     
     return checksum, size
 
+def link_or_copy(src, dst):
+    """Hardlink src to dst, copying instead when linking fails (e.g. cross-device)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def remove_path(path):
+    """Delete a file, symlink or directory tree"""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+def sync_file(src_entry, dst):
+    """Link src_entry to dst unless dst already has the same mtime and size, returns True if updated"""
+    try:
+        dst_stat = os.stat(dst, follow_symlinks=False)
+    except FileNotFoundError:
+        dst_stat = None
+    if dst_stat is not None:
+        src_stat = src_entry.stat(follow_symlinks=False)
+        if (dst_stat.st_mtime_ns == src_stat.st_mtime_ns and dst_stat.st_size == src_stat.st_size
+                and not os.path.isdir(dst)):
+            return False
+        # Never write through dst: it may be a hardlink to the source file
+        remove_path(dst)
+    link_or_copy(src_entry.path, dst)
+    return True
+
+def sync_tree(src, dst):
+    """Mirror directory src into dst (rsync-style on mtime/size), returns non-hidden file count"""
+    if os.path.exists(dst) and not os.path.isdir(dst):
+        os.unlink(dst)
+    os.makedirs(dst, exist_ok=True)
+    file_count = 0
+    seen = set()
+    with os.scandir(src) as it:
+        for entry in it:
+            seen.add(entry.name)
+            target = os.path.join(dst, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                file_count += sync_tree(entry.path, target)
+            else:
+                sync_file(entry, target)
+                if not entry.name.startswith('.'):
+                    file_count += 1
+    # Drop whatever no longer exists in src
+    with os.scandir(dst) as it:
+        stale = [entry.path for entry in it if entry.name not in seen]
+    for path in stale:
+        remove_path(path)
+    return file_count
+
+def get_push_state():
+    """Describe what a push would publish: BSP hash, JSON hash and local HEAD"""
+    result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True)
+    return {
+        "bsp_hash": get_bsp_snapshot()[0],
+        "json_sha256": calculate_sha256(JSON_FILE) if JSON_FILE.exists() else None,
+        "head": result.stdout.strip(),
+    }
+
+def is_push_up_to_date():
+    """True if nothing changed since the last successful push"""
+    if not LAST_PUSH_FILE.exists():
+        return False
+    try:
+        with open(LAST_PUSH_FILE, 'r', encoding='utf-8') as f:
+            last_push = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return last_push == get_push_state()
+
+def configure_git_remote(repo_url):
+    """Apply push-related git config and point origin at the token URL"""
+    # Sequential on purpose: concurrent 'git config' calls fight over .git/config.lock
+    subprocess.run(["git", "config", "http.postBuffer", "524288000"], cwd=BASE_DIR, check=False)
+    subprocess.run(["git", "config", "http.timeout", "600"], cwd=BASE_DIR, check=False)
+    subprocess.run(["git", "remote", "set-url", "origin", repo_url], cwd=BASE_DIR, check=True)
 
 def push_bsp_to_github_root():
     """Push arduino-esp32-master contents to GitHub ROOT (not the folder itself)"""
@@ -198,72 +448,68 @@ def push_bsp_to_github_root():
     if not BSP_SOURCE.exists():
         raise FileNotFoundError(f"BSP source not found: {BSP_SOURCE}")
     
-    # Configure git
-    subprocess.run(["git", "config", "http.postBuffer", "524288000"], cwd=BASE_DIR, check=False)
-    subprocess.run(["git", "config", "http.timeout", "600"], cwd=BASE_DIR, check=False)
-    subprocess.run(["git", "remote", "set-url", "origin", repo_url], cwd=BASE_DIR, check=True)
+    # Skip the sync, add and push entirely when the last push already has everything
+    if is_push_up_to_date():
+        print("  ℹ️  No changes since last push - everything is up to date")
+        return 0
+    
+    # Configure git in the background while the files are synced
+    git_config_pool = ThreadPoolExecutor(max_workers=1)
+    git_configured = git_config_pool.submit(configure_git_remote, repo_url)
+    git_config_pool.shutdown(wait=False)
     
     # Copy all contents from arduino-esp32-master to root (not the folder itself)
     print("  Syncing files from arduino-esp32-master to root...")
     file_count = 0
     
-    for item in BSP_SOURCE.iterdir():
-        if item.name.startswith('.'):
-            continue
-        
+    with os.scandir(BSP_SOURCE) as it:
+        items = [entry for entry in it if not entry.name.startswith('.')]
+    
+    for item in items:
         dest = BASE_DIR / item.name
         
-        # Skip if it's a script file or ZIP
-        if item.name.endswith(('.bat', '.py', '.zip', '.json')) and item != JSON_FILE:
+        # Skip if it's a script file, ZIP or JSON (the root JSON is generated
+        # by update_json_with_zip_info and must not be replaced by the BSP's copy)
+        if item.name.endswith(('.bat', '.py', '.zip', '.json')):
             continue
         
-        # Remove existing if it exists (except arduino-esp32-master folder itself)
-        if dest.exists() and dest != BSP_SOURCE:
-            if dest.is_dir():
-                shutil.rmtree(dest)
-            else:
-                dest.unlink()
+        if dest == BSP_SOURCE:
+            continue
         
-        # Copy to root
-        if item.is_dir():
-            shutil.copytree(item, dest)
-            # Count files
-            for root, dirs, files in os.walk(dest):
-                file_count += len([f for f in files if not f.startswith('.')])
+        # Only changed files are relinked (hardlinks share the bytes already in
+        # arduino-esp32-master); unchanged ones are left alone
+        if item.is_dir(follow_symlinks=False):
+            file_count += sync_tree(item.path, dest)
         else:
-            shutil.copy2(item, dest)
+            sync_file(item, dest)
             file_count += 1
     
     print(f"  Synced {file_count} files to root level")
     
+    # Git config must be in place before touching the index (re-raises its errors)
+    git_configured.result()
+    
     # Add files to git (from root, NOT from arduino-esp32-master folder)
     print("  Adding changes to git...")
     
-    exclude_items = {'arduino-esp32-master', '.git', '.github_token', 'temp_bsp_copy'}
-    exclude_extensions = {'.bat', '.py', '.zip'}  # Exclude scripts and ZIP (ZIP is too large)
+    exclude_items = ['arduino-esp32-master', 'temp_bsp_copy']
+    exclude_extensions = ['.bat', '.py', '.zip']  # Exclude scripts and ZIP (ZIP is too large)
     
-    # Add JSON file explicitly (it should be pushed)
-    if JSON_FILE.exists():
-        subprocess.run(["git", "add", "-f", JSON_FILE.name], cwd=BASE_DIR, check=False, capture_output=True)
+    # Excludes are top-level only, so they are passed as exclude pathspecs rather
+    # than a .gitignore (which would also stop -f from adding ignored BSP files);
+    # hidden top-level entries (.git, .github_token, caches) are skipped as well
+    pathspecs = [".", ":(top,exclude,glob).*", ":(top,exclude,glob).*/**"]
+    pathspecs += [f":(top,exclude){name}" for name in exclude_items]
+    pathspecs += [f":(top,exclude,glob)*{ext}" for ext in exclude_extensions]
     
-    # Add all BSP files from root
-    for item in BASE_DIR.iterdir():
-        if item.name in exclude_items or item.name.startswith('.'):
-            continue
-        if item.suffix in exclude_extensions:
-            continue
-        # Skip JSON as it's already added above
-        if item.name == JSON_FILE.name:
-            continue
-        
-        if item.is_file():
-            subprocess.run(["git", "add", "-f", item.name], cwd=BASE_DIR, check=False, capture_output=True)
-        elif item.is_dir():
-            subprocess.run(["git", "add", "-f", f"{item.name}/"], cwd=BASE_DIR, check=False, capture_output=True)
-    
-    # Check if there are any changes to commit
-    result = subprocess.run(["git", "status", "--porcelain"], cwd=BASE_DIR, capture_output=True, text=True)
-    if not result.stdout.strip():
+    # git walks the tree and stages additions, changes and deletions in one pass;
+    # --ignore-errors keeps going past a bad path
+    subprocess.run(["git", "add", "-A", "-f", "--ignore-errors", "--", *pathspecs],
+                   cwd=BASE_DIR, check=False, capture_output=True)
+    
+    # Check if there are any staged changes to commit (untracked files don't count)
+    result = subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=BASE_DIR)
+    if result.returncode == 0:
         print("  ℹ️  No changes to commit - everything is up to date")
         return file_count
     
@@ -287,6 +533,10 @@ def push_bsp_to_github_root():
         text=True
     )
     
+    # Remember what was pushed so an unchanged rerun can skip all of the above
+    with open(LAST_PUSH_FILE, 'w', encoding='utf-8') as f:
+        json.dump(get_push_state(), f)
+    
     return file_count
 
 def main():
@@ -302,7 +552,8 @@ def main():
     
     tasks_completed = 0
     tasks_failed = 0
-    # Total tasks will be dynamic: 5 if ZIP update needed, 2 if not
+    # Total tasks will be dynamic: 5 if ZIP update needed, 3 if not
+    total_tasks = 5
     
     try:
         # Task 1: Check if ZIP needs update
@@ -340,13 +591,21 @@ def main():
                              f"Pushed changes ({pushed_count} files synced)")
             tasks_completed += 1
         else:
+            total_tasks = 3
             print_task_status(1, total_tasks, "Check if ZIP needs update", "SUCCESS", "No changes - ZIP is up to date")
             tasks_completed += 1
             
-            # Task 2: Push changes to GitHub (ZIP already exists, no need to recreate)
-            print_task_status(2, total_tasks, "Push changes to GitHub", "RUNNING")
+            # Task 2: Refresh JSON (checksum comes from cache, ZIP is not re-read)
+            print_task_status(2, total_tasks, "Update JSON with checksum and size", "RUNNING")
+            checksum, size = update_json_with_zip_info()
+            print_task_status(2, total_tasks, "Update JSON with checksum and size", "SUCCESS",
+                             f"Checksum: SHA-256:{checksum[:16]}..., Size: {int(size) / (1024*1024):.2f} MB")
+            tasks_completed += 1
+            
+            # Task 3: Push changes to GitHub (ZIP already exists, no need to recreate)
+            print_task_status(3, total_tasks, "Push changes to GitHub", "RUNNING")
             pushed_count = push_bsp_to_github_root()
-            print_task_status(2, total_tasks, "Push changes to GitHub", "SUCCESS",
+            print_task_status(3, total_tasks, "Push changes to GitHub", "SUCCESS",
                              f"Pushed changes ({pushed_count} files synced)")
             tasks_completed += 1
         
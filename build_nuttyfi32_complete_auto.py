@@ -11,11 +11,15 @@ This script does EVERYTHING automatically:
 
 import os
 import json
+import mmap
+import zlib
 import zipfile
 import shutil
 import hashlib
 import subprocess
+import sys
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # ==================== CONFIGURATION ====================
 VERSION = "1.0.0"
@@ -24,15 +28,38 @@ BSP_SOURCE = BASE_DIR / "arduino-esp32-master"
 OUTPUT_ZIP = BASE_DIR / f"nuttyfi32-{VERSION}.zip"
 JSON_TEMPLATE = BASE_DIR / "package" / "package_nuttyfi32_index.template.json"
 JSON_OUTPUT = BASE_DIR / "package_nuttyfi32_index.json"
+BUILD_CACHE = BASE_DIR / ".build_cache.json"  # BSP fingerprint + SHA-256/size of the last OUTPUT_ZIP
+BSP_HASH_CONTENTS = False  # True = rebuild detection hashes file contents, not just mtime/size
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB read buffer for hashing
+ZIP_WRITE_BUFFER = 1024 * 1024  # 1 MiB write buffer for OUTPUT_ZIP (default is 8 KiB)
+# DEFLATE level 1 for quick developer builds; run with --release for level 9
+ZIP_COMPRESSLEVEL = 1
+ZIP_RELEASE_COMPRESSLEVEL = 9
+ZIP_MMAP_THRESHOLD = 64 * 1024  # Stored files at least this big are mapped, not read()
 GITHUB_BRANCH = "Master"
+# Already compressed / incompressible files are stored as-is instead of DEFLATEd
+STORED_EXTENSIONS = {'.bin', '.img', '.gz', '.zip', '.xz', '.7z', '.bz2', '.png', '.jpg', '.jpeg',
+                     '.woff2', '.pdf', '.exe', '.dll'}
+# Root-level items never staged by push_to_github
+PUSH_EXCLUDE_ITEMS = frozenset({'arduino-esp32-master', '.git', '.github_token', 'temp_bsp_copy'})
+PUSH_EXCLUDE_EXTENSIONS = frozenset({'.bat', '.py', '.zip'})  # Scripts and ZIP
 # =======================================================
 
 def calculate_sha256(file_path):
     """Calculate SHA-256 checksum"""
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+        # file_digest (Python 3.11+) reads and hashes in C with the GIL released
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest().upper()
+        # Older Pythons: one reusable 1 MiB buffer, no per-chunk allocation
+        sha256_hash = hashlib.sha256()
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
     return sha256_hash.hexdigest().upper()
 
 def get_file_size(file_path):
@@ -58,8 +85,85 @@ def print_task_status(task_num, total, task_name, status, details=""):
     if details:
         print(f"  └─ {details}")
 
+class HashingFile:
+    """Write-only file wrapper that SHA-256 hashes bytes as they are written"""
+    
+    def __init__(self, fp):
+        self._fp = fp
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+    
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self._fp.write(data)
+    
+    def tell(self):
+        return self.size
+    
+    def flush(self):
+        self._fp.flush()
+
+def iter_files(root):
+    """Yield DirEntry of every non-hidden file under root, skipping hidden folders (os.walk order)"""
+    files = []
+    dirs = []
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.name[0] == '.':
+                continue
+            # d_type from readdir, no stat() per entry
+            if entry.is_dir():
+                # Like os.walk: symlinked directories are not descended into
+                if not entry.is_symlink():
+                    dirs.append(entry.path)
+            else:
+                files.append(entry)
+    # A folder's files come before its subfolders, as with os.walk
+    yield from files
+    for path in dirs:
+        yield from iter_files(path)
+
+def compress_zip_entry(task):
+    """Read and compress one file for the ZIP (runs in a worker thread)"""
+    file_path, arcname, compress_type = task
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    zinfo.compress_type = compress_type
+    if compress_type == zipfile.ZIP_STORED and zinfo.file_size >= ZIP_MMAP_THRESHOLD:
+        # Large stored files go from the page cache to OUTPUT_ZIP without a
+        # read() copy; write_compressed_entry closes the mapping
+        with open(file_path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        zinfo.file_size = zinfo.compress_size = len(data)
+        zinfo.CRC = zlib.crc32(data)
+        return zinfo, data
+    with open(file_path, "rb") as f:
+        data = f.read()
+    if compress_type == zipfile.ZIP_DEFLATED:
+        # Same raw DEFLATE stream zipfile itself would produce
+        compressor = zlib.compressobj(ZIP_COMPRESSLEVEL, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+    else:
+        compressed = data
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    zinfo.compress_size = len(compressed)
+    return zinfo, compressed
+
+def write_compressed_entry(zipf, zinfo, compressed):
+    """Append an already-compressed member to an open ZipFile"""
+    zinfo.header_offset = zipf.fp.tell()
+    zipf.fp.write(zinfo.FileHeader())
+    zipf.fp.write(compressed)
+    if isinstance(compressed, mmap.mmap):
+        compressed.close()
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    # Central directory is written at start_dir when the ZipFile closes
+    zipf.start_dir = zipf.fp.tell()
+
 def create_zip_from_bsp():
-    """Create ZIP file from arduino-esp32-master folder"""
+    """Create ZIP file from arduino-esp32-master folder, returns (file count, SHA-256, size)"""
     if not BSP_SOURCE.exists():
         raise FileNotFoundError(f"BSP source not found: {BSP_SOURCE}")
     
@@ -71,24 +175,33 @@ def create_zip_from_bsp():
         OUTPUT_ZIP.unlink()
         print("  ✓ Deleted old ZIP file")
     
-    # Create ZIP with files at root level
+    # Create ZIP with files at root level. HashingFile has no seek(), so
+    # zipfile writes strictly sequentially and the SHA-256 of the archive is
+    # ready without reading it back
+    # Relative path from BSP_SOURCE is a slice of the entry path (no Path objects)
+    source_prefix = str(BSP_SOURCE) + os.sep
+    tasks = []
+    for entry in iter_files(BSP_SOURCE):
+        if os.path.splitext(entry.name)[1].lower() in STORED_EXTENSIONS:
+            compress_type = zipfile.ZIP_STORED
+        else:
+            compress_type = zipfile.ZIP_DEFLATED
+        tasks.append((entry.path, entry.path[len(source_prefix):], compress_type))
+    
+    # zlib releases the GIL, so files are compressed on all cores by a thread
+    # pool while the main thread appends finished members in order
     file_count = 0
-    with zipfile.ZipFile(OUTPUT_ZIP, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(BSP_SOURCE):
-            # Skip hidden files and folders
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            files = [f for f in files if not f.startswith('.')]
-            
-            for file in files:
-                file_path = Path(root) / file
-                # Get relative path from BSP_SOURCE
-                arcname = file_path.relative_to(BSP_SOURCE)
-                zipf.write(file_path, arcname)
-                file_count += 1
+    with open(OUTPUT_ZIP, 'wb', buffering=ZIP_WRITE_BUFFER) as raw:
+        out = HashingFile(raw)
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL) as zipf:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                for zinfo, compressed in executor.map(compress_zip_entry, tasks):
+                    write_compressed_entry(zipf, zinfo, compressed)
+                    file_count += 1
     
-    return file_count
+    return file_count, out.sha256.hexdigest().upper(), out.size
 
-def update_json_with_zip_info():
+def update_json_with_zip_info(checksum=None, size=None):
     """Update JSON file with ZIP checksum, size, and version"""
     if not OUTPUT_ZIP.exists():
         raise FileNotFoundError(f"ZIP file not found: {OUTPUT_ZIP}")
@@ -96,12 +209,14 @@ def update_json_with_zip_info():
     if not JSON_TEMPLATE.exists():
         raise FileNotFoundError(f"JSON template not found: {JSON_TEMPLATE}")
     
-    # Calculate checksum and size
-    checksum = calculate_sha256(OUTPUT_ZIP)
-    size = str(get_file_size(OUTPUT_ZIP))
+    # Calculate checksum and size unless create_zip_from_bsp already streamed them
+    if checksum is None:
+        checksum = calculate_sha256(OUTPUT_ZIP)
+    if size is None:
+        size = get_file_size(OUTPUT_ZIP)
     
     print(f"  Checksum: SHA-256:{checksum}")
-    print(f"  Size: {size} bytes ({int(size) / (1024*1024):.2f} MB)")
+    print(f"  Size: {size} bytes ({size / (1024*1024):.2f} MB)")
     
     # Read JSON template
     with open(JSON_TEMPLATE, 'r', encoding='utf-8') as f:
@@ -113,16 +228,164 @@ def update_json_with_zip_info():
     platform['url'] = f"https://github.com/itsbhupendrasingh/nuttyfi32/releases/download/{VERSION}/nuttyfi32-{VERSION}.zip"
     platform['archiveFileName'] = f"nuttyfi32-{VERSION}.zip"
     platform['checksum'] = f"SHA-256:{checksum}"
-    platform['size'] = size
+    platform['size'] = str(size)  # Boards Manager index stores size as a string
     
-    # Write updated JSON to root
-    with open(JSON_OUTPUT, 'w', encoding='utf-8') as f:
+    # Write updated JSON to root - via a temp file and os.replace, so a
+    # hardlink left by an older sync is never written through and a crash
+    # mid-write cannot leave a truncated index
+    tmp_json = JSON_OUTPUT.with_name(JSON_OUTPUT.name + ".tmp")
+    with open(tmp_json, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2)
+    os.replace(tmp_json, JSON_OUTPUT)
     
     print(f"  ✓ JSON updated: {JSON_OUTPUT}")
     
     return checksum, size
 
+def link_or_copy(src, dst):
+    """Hardlink src to dst, copying instead when linking fails (e.g. cross-device)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def hash_file_contents(file_path):
+    """BLAKE2b digest of a file's contents"""
+    # Rebuild detection only - BLAKE2b is faster than SHA-256 and needs no extra
+    # package. The Arduino JSON checksum still uses calculate_sha256().
+    hasher = hashlib.blake2b(digest_size=32)
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    with open(file_path, "rb") as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
+def calculate_bsp_fingerprint():
+    """Fingerprint of everything the ZIP and JSON are built from (paths, sizes, mtimes)"""
+    fingerprint = hashlib.blake2b(digest_size=16)
+    fingerprint.update(f"{VERSION}\0{ZIP_COMPRESSLEVEL}\0".encode())
+    entries = sorted((entry.path, entry.stat()) for entry in iter_files(BSP_SOURCE))
+    if JSON_TEMPLATE.exists():
+        entries.append((str(JSON_TEMPLATE), JSON_TEMPLATE.stat()))
+    # Content digest survives touch/checkout; mtime is far cheaper
+    if BSP_HASH_CONTENTS:
+        # hashlib releases the GIL, so threads overlap open/read/hash across files
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            stamps = list(executor.map(hash_file_contents, [path for path, _ in entries]))
+    else:
+        stamps = [st.st_mtime_ns for _, st in entries]
+    for (path, st), stamp in zip(entries, stamps):
+        fingerprint.update(f"{path}\0{stamp}\0{st.st_size}\0".encode('utf-8', 'surrogateescape'))
+    return fingerprint.hexdigest()
+
+def load_build_cache(fingerprint):
+    """Return (checksum, size) of OUTPUT_ZIP if it and the JSON were built from this exact BSP, else None"""
+    try:
+        with open(BUILD_CACHE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        zip_stat = OUTPUT_ZIP.stat()
+    except (OSError, ValueError):
+        return None
+    if not JSON_OUTPUT.exists():
+        return None
+    if (cache.get('fingerprint') != fingerprint
+            or cache.get('zip_size') != zip_stat.st_size
+            or cache.get('zip_mtime_ns') != zip_stat.st_mtime_ns):
+        return None
+    return cache['sha256'], zip_stat.st_size
+
+def save_build_cache(fingerprint, checksum):
+    """Remember which BSP state OUTPUT_ZIP and the JSON were built from"""
+    zip_stat = OUTPUT_ZIP.stat()
+    with open(BUILD_CACHE, 'w', encoding='utf-8') as f:
+        json.dump({
+            'fingerprint': fingerprint,
+            'zip_size': zip_stat.st_size,
+            'zip_mtime_ns': zip_stat.st_mtime_ns,
+            'sha256': checksum,
+        }, f)
+
+def remove_path(path):
+    """Delete a file, symlink or directory tree"""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+def sync_file(src_entry, dst):
+    """Link src_entry to dst unless dst already has the same mtime and size, returns True if updated"""
+    try:
+        dst_stat = os.stat(dst, follow_symlinks=False)
+    except FileNotFoundError:
+        dst_stat = None
+    if dst_stat is not None:
+        src_stat = src_entry.stat(follow_symlinks=False)
+        if (dst_stat.st_mtime_ns == src_stat.st_mtime_ns and dst_stat.st_size == src_stat.st_size
+                and not os.path.isdir(dst)):
+            return False
+        # Never write through dst: it may be a hardlink to the source file
+        remove_path(dst)
+    link_or_copy(src_entry.path, dst)
+    return True
+
+def sync_tree(src, dst):
+    """Mirror directory src into dst (rsync-style on mtime/size), returns non-hidden file count"""
+    if os.path.exists(dst) and not os.path.isdir(dst):
+        os.unlink(dst)
+    os.makedirs(dst, exist_ok=True)
+    file_count = 0
+    seen = set()
+    with os.scandir(src) as it:
+        for entry in it:
+            seen.add(entry.name)
+            target = os.path.join(dst, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                file_count += sync_tree(entry.path, target)
+            else:
+                sync_file(entry, target)
+                if entry.name[0] != '.':
+                    file_count += 1
+    # Drop whatever no longer exists in src
+    with os.scandir(dst) as it:
+        stale = [entry.path for entry in it if entry.name not in seen]
+    for path in stale:
+        remove_path(path)
+    return file_count
+
+def get_json_text():
+    """Contents of JSON_OUTPUT with newlines normalized, None if it is missing"""
+    try:
+        return JSON_OUTPUT.read_bytes().replace(b'\r\n', b'\n')
+    except OSError:
+        return None
+
+def get_pushed_json_text():
+    """Contents of the JSON on origin's branch (as of the last fetch/push) with newlines normalized, None if unknown"""
+    result = subprocess.run(
+        ["git", "show", f"origin/{GITHUB_BRANCH}:{JSON_OUTPUT.name}"],
+        cwd=BASE_DIR,
+        capture_output=True
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.replace(b'\r\n', b'\n')
+
+def get_unpushed_count():
+    """Number of local commits not on origin's branch (as of the last fetch/push), None if unknown"""
+    result = subprocess.run(
+        ["git", "rev-list", "--count", f"origin/{GITHUB_BRANCH}..HEAD"],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None
+    return int(result.stdout.strip())
+
 def push_to_github():
     """Push BSP files and JSON to GitHub"""
     token = get_token()
@@ -131,8 +394,16 @@ def push_to_github():
     
     repo_url = f"https://{token}@github.com/itsbhupendrasingh/nuttyfi32.git"
     
+    # JSON identical to the one already pushed (same ZIP checksum, version,
+    # URL and template data) and no local commits waiting (e.g. from a run
+    # whose push failed): nothing to sync, add or push
+    unpushed = get_unpushed_count()
+    json_text = get_json_text()
+    if unpushed == 0 and json_text is not None and json_text == get_pushed_json_text():
+        print("  ℹ️  No changes since last push - everything is up to date")
+        return 0
+    
     # Configure git
-    subprocess.run(["git", "config", "http.postBuffer", "524288000"], cwd=BASE_DIR, check=False)
     subprocess.run(["git", "config", "http.timeout", "600"], cwd=BASE_DIR, check=False)
     subprocess.run(["git", "remote", "set-url", "origin", repo_url], cwd=BASE_DIR, check=True)
     
@@ -140,31 +411,26 @@ def push_to_github():
     print("  Syncing files from arduino-esp32-master to root...")
     file_count = 0
     
-    for item in BSP_SOURCE.iterdir():
-        if item.name.startswith('.'):
-            continue
-        
+    with os.scandir(BSP_SOURCE) as it:
+        items = [entry for entry in it if entry.name[0] != '.']
+    
+    for item in items:
         dest = BASE_DIR / item.name
         
-        # Skip if it's a script file or ZIP
-        if item.name.endswith(('.bat', '.py', '.zip')):
+        # Skip if it's a script file or ZIP, and the BSP's own copy of the
+        # generated JSON (it would replace the updated one in root)
+        if item.name.endswith(('.bat', '.py', '.zip')) or item.name == JSON_OUTPUT.name:
             continue
         
-        # Remove existing if it exists (except arduino-esp32-master folder itself)
-        if dest.exists() and dest != BSP_SOURCE:
-            if dest.is_dir():
-                shutil.rmtree(dest)
-            else:
-                dest.unlink()
+        if dest == BSP_SOURCE:
+            continue
         
-        # Copy to root
-        if item.is_dir():
-            shutil.copytree(item, dest)
-            # Count files
-            for root, dirs, files in os.walk(dest):
-                file_count += len([f for f in files if not f.startswith('.')])
+        # Mirror into root instead of deleting and recreating it: only changed
+        # files are relinked (hardlinks share the bytes in arduino-esp32-master)
+        if item.is_dir(follow_symlinks=False):
+            file_count += sync_tree(item.path, dest)
         else:
-            shutil.copy2(item, dest)
+            sync_file(item, dest)
             file_count += 1
     
     print(f"  Synced {file_count} files to root level")
@@ -172,52 +438,76 @@ def push_to_github():
     # Add files to git
     print("  Adding changes to git...")
     
-    exclude_items = {'arduino-esp32-master', '.git', '.github_token', 'temp_bsp_copy'}
-    exclude_extensions = {'.bat', '.py', '.zip'}  # Exclude scripts and ZIP
+    to_add = []
     
     # Add JSON file explicitly
     if JSON_OUTPUT.exists():
-        subprocess.run(["git", "add", "-f", JSON_OUTPUT.name], cwd=BASE_DIR, check=False, capture_output=True)
+        to_add.append(JSON_OUTPUT.name)
     
     # Add all BSP files from root
     for item in BASE_DIR.iterdir():
-        if item.name in exclude_items or item.name.startswith('.'):
+        if item.name in PUSH_EXCLUDE_ITEMS or item.name[0] == '.':
             continue
-        if item.suffix in exclude_extensions:
+        if item.suffix in PUSH_EXCLUDE_EXTENSIONS:
             continue
         # Skip JSON as it's already added above
         if item.name == JSON_OUTPUT.name:
             continue
         
         if item.is_file():
-            subprocess.run(["git", "add", "-f", item.name], cwd=BASE_DIR, check=False, capture_output=True)
+            to_add.append(item.name)
         elif item.is_dir():
-            subprocess.run(["git", "add", "-f", f"{item.name}/"], cwd=BASE_DIR, check=False, capture_output=True)
+            to_add.append(f"{item.name}/")
+    
+    # One git process for everything, paths fed on stdin; --ignore-errors
+    # keeps going past a bad path like the old one-call-per-item loop did
+    if to_add:
+        subprocess.run(
+            ["git", "--literal-pathspecs", "add", "-f", "--ignore-errors",
+             "--pathspec-from-file=-", "--pathspec-file-nul"],
+            input="\0".join(to_add),
+            cwd=BASE_DIR,
+            check=False,
+            capture_output=True,
+            text=True
+        )
     
-    # Check if there are any changes to commit
-    result = subprocess.run(["git", "status", "--porcelain"], cwd=BASE_DIR, capture_output=True, text=True)
-    if not result.stdout.strip():
+    # Check if anything was staged (untracked files such as .github_token
+    # don't count, they are never committed)
+    staged = subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=BASE_DIR).returncode != 0
+    if staged:
+        # Commit
+        subprocess.run(
+            ["git", "commit", "-m", f"Update nuttyfi32 BSP v{VERSION} - auto build"],
+            cwd=BASE_DIR,
+            check=True
+        )
+    elif unpushed == 0:
         print("  ℹ️  No changes to commit - everything is up to date")
         return file_count
-    
-    # Commit
-    subprocess.run(
-        ["git", "commit", "-m", f"Update nuttyfi32 BSP v{VERSION} - auto build"],
-        cwd=BASE_DIR,
-        check=True
-    )
+    else:
+        # Nothing new, but an earlier commit never reached GitHub: push it now
+        print("  ℹ️  No new changes - pushing earlier unpushed commit(s)")
     
     # Push
     print("  ⚠️  Pushing to GitHub (this will take time)...")
     print("  Please wait, do NOT close this window...")
     
-    result = subprocess.run(
-        ["git", "push", "origin", GITHUB_BRANCH],
+    # git's progress goes straight to the console instead of being buffered
+    # in memory until exit; a stalled transfer aborts long before the timeout
+    env = os.environ.copy()
+    env.setdefault("GIT_HTTP_LOW_SPEED_LIMIT", "1000")  # bytes/s
+    env.setdefault("GIT_HTTP_LOW_SPEED_TIME", "120")  # seconds below the limit
+    # HTTP/2 and git's default 1 MiB http.postBuffer (the pack is streamed in
+    # chunks, not held in the 500 MB buffer the other scripts configure) are
+    # passed with -c for this push only, so the shared .git/config is not rewritten
+    subprocess.run(
+        ["git", "-c", "http.version=HTTP/2", "-c", "http.postBuffer=1048576",
+         "push", "origin", GITHUB_BRANCH],
         cwd=BASE_DIR,
         check=True,
         timeout=1800,
-        capture_output=True,
-        text=True
+        env=env
     )
     
     return file_count
@@ -230,6 +520,7 @@ def main():
     print(f"\nVersion: {VERSION}")
     print(f"BSP Source: {BSP_SOURCE}")
     print(f"Output ZIP: {OUTPUT_ZIP}")
+    print(f"Compression: level {ZIP_COMPRESSLEVEL}")
     print(f"JSON Template: {JSON_TEMPLATE}")
     print(f"JSON Output: {JSON_OUTPUT}")
     print("=" * 70)
@@ -239,20 +530,33 @@ def main():
     total_tasks = 4
     
     try:
-        # Task 1: Create ZIP from arduino-esp32-master
-        print_task_status(1, total_tasks, "Create ZIP from arduino-esp32-master", "RUNNING")
-        file_count = create_zip_from_bsp()
-        zip_size = get_file_size(OUTPUT_ZIP) / (1024 * 1024)  # MB
-        print_task_status(1, total_tasks, "Create ZIP from arduino-esp32-master", "SUCCESS", 
-                         f"Created {OUTPUT_ZIP.name} ({file_count} files, {zip_size:.2f} MB)")
-        tasks_completed += 1
-        
-        # Task 2: Update JSON with checksum and size
-        print_task_status(2, total_tasks, "Update JSON with checksum and size", "RUNNING")
-        checksum, size = update_json_with_zip_info()
-        print_task_status(2, total_tasks, "Update JSON with checksum and size", "SUCCESS",
-                         f"Checksum: SHA-256:{checksum[:16]}..., Size: {int(size) / (1024*1024):.2f} MB")
-        tasks_completed += 1
+        # Tasks 1-2 are skipped when the BSP is unchanged since the last build
+        fingerprint = calculate_bsp_fingerprint()
+        cached = load_build_cache(fingerprint)
+        if cached:
+            checksum, zip_bytes = cached
+            print_task_status(1, total_tasks, "Create ZIP from arduino-esp32-master", "SUCCESS",
+                             f"BSP unchanged - reusing {OUTPUT_ZIP.name} ({zip_bytes / (1024*1024):.2f} MB)")
+            tasks_completed += 1
+            print_task_status(2, total_tasks, "Update JSON with checksum and size", "SUCCESS",
+                             f"Already up to date (SHA-256:{checksum[:16]}...)")
+            tasks_completed += 1
+        else:
+            # Task 1: Create ZIP from arduino-esp32-master
+            print_task_status(1, total_tasks, "Create ZIP from arduino-esp32-master", "RUNNING")
+            file_count, zip_checksum, zip_bytes = create_zip_from_bsp()
+            zip_size = zip_bytes / (1024 * 1024)  # MB
+            print_task_status(1, total_tasks, "Create ZIP from arduino-esp32-master", "SUCCESS", 
+                             f"Created {OUTPUT_ZIP.name} ({file_count} files, {zip_size:.2f} MB)")
+            tasks_completed += 1
+            
+            # Task 2: Update JSON with checksum and size
+            print_task_status(2, total_tasks, "Update JSON with checksum and size", "RUNNING")
+            checksum, size = update_json_with_zip_info(zip_checksum, zip_bytes)
+            save_build_cache(fingerprint, checksum)
+            print_task_status(2, total_tasks, "Update JSON with checksum and size", "SUCCESS",
+                             f"Checksum: SHA-256:{checksum[:16]}..., Size: {size / (1024*1024):.2f} MB")
+            tasks_completed += 1
         
         # Task 3: Push changes to GitHub
         print_task_status(3, total_tasks, "Push changes to GitHub", "RUNNING")
@@ -294,6 +598,8 @@ def main():
     input("\nPress Enter to close this window...")
 
 if __name__ == "__main__":
+    if "--release" in sys.argv[1:]:
+        ZIP_COMPRESSLEVEL = ZIP_RELEASE_COMPRESSLEVEL
     try:
         main()
     except KeyboardInterrupt:
@@ -11,12 +11,17 @@ Sab kuch automatically handle karta hai:
 """
 
 import os
+import re
 import json
+import mmap
+import zlib
 import zipfile
 import shutil
+import struct
 import hashlib
 import subprocess
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # ==================== CONFIGURATION ====================
 VERSION = "1.0.0"
@@ -28,13 +33,28 @@ JSON_TEMPLATE = BASE_DIR / "package" / "package_nuttyfi32_index.template.json"
 JSON_OUTPUT = BASE_DIR / "package_nuttyfi32_index.json"
 TEMP_DIR = BASE_DIR / "temp_build"
 GITHUB_BRANCH = "Master"
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB reads when hashlib.file_digest is unavailable
+HASH_MMAP_SLICE = 16 * 1024 * 1024  # mmap hashing feeds SHA-256 16 MiB at a time
+ZIP_COMPRESSLEVEL = 1  # zlib level 1: several times faster than the default 6, ZIP slightly larger
+# BSP files rewritten for nuttyfi32 (paths relative to the BSP root folder)
+BSP_PATCHED_FILES = ("package.json", "platform.txt", "boards.txt")
+ESP32_PACKAGE_TEMPLATE = "package/package_esp32_index.template.json"
+NUTTYFI32_PACKAGE_TEMPLATE = "package/package_nuttyfi32_index.template.json"
+# platform.txt edits: first ESP32 name= line, and python -> python3 for these keys
+PLATFORM_NAME_RE = re.compile(r'^name=[^\n]*ESP32[^\n]*$', re.MULTILINE)
+PLATFORM_PYTHON_RE = re.compile(
+    r'^(tools\.esptool_py\.network_cmd|tools\.gen_esp32part\.cmd'
+    r'|recipe\.objcopy\.bin\.pattern\.linux|tools\.esptool_py\.upload\.pattern\.linux)=python(?!3)',
+    re.MULTILINE
+)
 # =======================================================
 
-def run_git(cmd, allow_failure=False, capture_output=False, timeout=None):
+def run_git(cmd, allow_failure=False, capture_output=False, timeout=None, input=None):
     """Run a git command with consistent defaults."""
     result = subprocess.run(
         ["git"] + cmd,
         cwd=BASE_DIR,
+        input=input,
         text=True,
         capture_output=capture_output,
         timeout=timeout,
@@ -59,23 +79,53 @@ def ensure_git_ready():
 def sync_with_remote():
     """Fetch + rebase onto origin to avoid push rejection."""
     print("  🔄 Syncing with origin...")
-    run_git(["fetch", "origin", GITHUB_BRANCH])
+    # pull fetches origin/<branch> itself - no separate git fetch round trip
     result = run_git(["pull", "--rebase", "origin", GITHUB_BRANCH], allow_failure=True, capture_output=True)
     if result.returncode != 0:
         stdout = result.stdout.strip()
         stderr = result.stderr.strip()
         raise RuntimeError(
-            "git pull --rebase failed. Resolve conflicts manually and rerun.\n"
+            "git pull --rebase failed. Check the connection or resolve conflicts manually and rerun.\n"
             f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}"
         )
     print("  ✓ Repository is up to date with origin")
 
+def is_in_sync_with_remote():
+    """True if no tracked file is modified and HEAD is what origin has for GITHUB_BRANCH."""
+    status = run_git(["status", "--porcelain", "--untracked-files=no"], allow_failure=True, capture_output=True)
+    if status.returncode != 0 or status.stdout.strip():
+        return False
+    try:
+        remote = run_git(["ls-remote", "origin", f"refs/heads/{GITHUB_BRANCH}"],
+                         allow_failure=True, capture_output=True, timeout=60)
+    except subprocess.TimeoutExpired:
+        return False
+    head = run_git(["rev-parse", "HEAD"], allow_failure=True, capture_output=True)
+    if remote.returncode != 0 or head.returncode != 0:
+        return False
+    remote_sha = remote.stdout.split()[0] if remote.stdout.strip() else None
+    return remote_sha == head.stdout.strip()
+
 def calculate_sha256(file_path):
     """Calculate SHA-256 checksum"""
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+        # Python 3.11+: the whole read/hash loop runs in C
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest().upper()
+        sha256_hash = hashlib.sha256()
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            # Older Pythons: hash straight from the page cache, no read() copies
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                for offset in range(0, size, HASH_MMAP_SLICE):
+                    sha256_hash.update(view[offset:offset + HASH_MMAP_SLICE])
+            return sha256_hash.hexdigest().upper()
+        # Files that report no size (empty, or not regular files): read into
+        # one reusable buffer instead of allocating bytes per chunk
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            sha256_hash.update(view[:n])
     return sha256_hash.hexdigest().upper()
 
 def get_file_size(file_path):
@@ -106,25 +156,24 @@ def calculate_zip_hash(zip_path):
     if not zip_path.exists():
         return None
     
-    hasher = hashlib.sha256()
+    # Local change detection only, so BLAKE2b instead of SHA-256
+    hasher = hashlib.blake2b(digest_size=32)
     try:
         with zipfile.ZipFile(zip_path, 'r') as zf:
-            # Get all file info (name, size, CRC)
-            file_info = []
-            for info in zf.infolist():
-                if not info.filename.startswith('.'):
-                    file_info.append((info.filename, info.file_size, info.CRC))
-            
-            # Sort for consistent hashing
-            file_info.sort()
-            
-            # Create hash from file info
-            for filename, size, crc in file_info:
-                hasher.update(f"{filename}:{size}:{crc}".encode())
+            # Get all file info (name, size, CRC) from the central directory
+            file_info = sorted(
+                (info.filename, info.file_size, info.CRC)
+                for info in zf.infolist()
+                if not info.filename.startswith('.')
+            )
+        
+        # Hash all entries in one update call instead of one per file
+        hasher.update("\n".join(f"{filename}\0{size}\0{crc}" for filename, size, crc in file_info).encode())
     except:
         return None
     
-    return hasher.hexdigest()
+    # Tagged so a .zip_hash written by the old SHA-256 version never matches
+    return "b2:" + hasher.hexdigest()
 
 def check_if_zip_needs_update():
     """Check if ZIP needs to be updated based on source changes"""
@@ -249,6 +298,65 @@ def ensure_bsp_source_folder():
     if extracted_folder.exists() and not BSP_SOURCE.exists():
         extracted_folder.rename(BSP_SOURCE)
 
+def patch_bsp_file_content(file_name, content):
+    """Return content of a BSP key file (platform.txt, boards.txt) with the nuttyfi32 changes applied"""
+    # Update platform.txt
+    if file_name == "platform.txt":
+        # One regex pass each instead of a per-line, per-key loop
+        content = PLATFORM_NAME_RE.sub('name=nuttyfi32 Arduino', content, count=1)
+        content = PLATFORM_PYTHON_RE.sub(r'\1=python3', content)
+    
+    # Update boards.txt - add nuttyfi32 board
+    if file_name == "boards.txt":
+        lines = content.split('\n')
+        
+        # Find esp32.name line
+        esp32_start = None
+        esp32_end = None
+        for i, line in enumerate(lines):
+            if line.strip() == "esp32.name=ESP32 Dev Module" and esp32_start is None:
+                esp32_start = i
+            elif esp32_start is not None and esp32_end is None:
+                if line.strip() and not line.strip().startswith('esp32.') and not line.strip().startswith('#') and not line.strip() == '':
+                    if not line.strip().startswith('esp32.menu.'):
+                        esp32_end = i
+                        break
+        
+        if esp32_start is not None:
+            if esp32_end is None:
+                esp32_end = len(lines)
+                for i in range(esp32_start + 1, len(lines)):
+                    line = lines[i].strip()
+                    if '.name=' in line and not line.startswith('esp32.') and not line.startswith('#'):
+                        esp32_end = i
+                        break
+            
+            # Extract esp32 section
+            esp32_section = lines[esp32_start:esp32_end]
+            
+            # Create nuttyfi32 section
+            nuttyfi32_section = []
+            nuttyfi32_section.append("")
+            nuttyfi32_section.append("##############################################################")
+            nuttyfi32_section.append("# nuttyfi32 Dev Module")
+            nuttyfi32_section.append("##############################################################")
+            nuttyfi32_section.append("")
+            
+            for line in esp32_section:
+                if line.strip().startswith('esp32.'):
+                    nuttyfi32_line = line.replace('esp32.', 'nuttyfi32.', 1)
+                    nuttyfi32_section.append(nuttyfi32_line)
+                elif line.strip() == '' or line.strip().startswith('#'):
+                    nuttyfi32_section.append(line)
+            
+            # Insert nuttyfi32 section after esp32 section
+            lines[esp32_end:esp32_end] = nuttyfi32_section
+            print(f"    ✓ Added nuttyfi32 board entry to boards.txt")
+        
+        content = '\n'.join(lines)
+    
+    return content
+
 def rename_esp32_to_nuttyfi32(directory):
     """Rename esp32 references to nuttyfi32 in files and content"""
     print("  Renaming esp32 to nuttyfi32...")
@@ -263,13 +371,7 @@ def rename_esp32_to_nuttyfi32(directory):
             print(f"    ✓ Renamed: package_esp32_index.template.json -> package_nuttyfi32_index.template.json")
     
     # 2. Update content in key files
-    files_to_update = [
-        "package.json",
-        "platform.txt",
-        "boards.txt",
-    ]
-    
-    for file_name in files_to_update:
+    for file_name in BSP_PATCHED_FILES:
         file_path = directory / file_name
         if not file_path.exists():
             continue
@@ -278,81 +380,7 @@ def rename_esp32_to_nuttyfi32(directory):
             content = f.read()
         
         original_content = content
-        
-        # Update platform.txt
-        if file_name == "platform.txt":
-            lines = content.split('\n')
-            for i, line in enumerate(lines):
-                if line.startswith('name=') and 'ESP32' in line:
-                    lines[i] = 'name=nuttyfi32 Arduino'
-                    break
-            python_keys = [
-                "tools.esptool_py.network_cmd",
-                "tools.gen_esp32part.cmd",
-                "recipe.objcopy.bin.pattern.linux",
-                "tools.esptool_py.upload.pattern.linux",
-            ]
-            def replace_python_with_python3(line, key):
-                prefix = f"{key}=python"
-                if line.startswith(prefix):
-                    return f"{key}=python3{line[len(prefix):]}"
-                return line
-            for i, line in enumerate(lines):
-                for key in python_keys:
-                    new_line = replace_python_with_python3(line, key)
-                    if new_line != line:
-                        line = new_line
-                lines[i] = line
-            content = '\n'.join(lines)
-        
-        # Update boards.txt - add nuttyfi32 board
-        if file_name == "boards.txt":
-            lines = content.split('\n')
-            
-            # Find esp32.name line
-            esp32_start = None
-            esp32_end = None
-            for i, line in enumerate(lines):
-                if line.strip() == "esp32.name=ESP32 Dev Module" and esp32_start is None:
-                    esp32_start = i
-                elif esp32_start is not None and esp32_end is None:
-                    if line.strip() and not line.strip().startswith('esp32.') and not line.strip().startswith('#') and not line.strip() == '':
-                        if not line.strip().startswith('esp32.menu.'):
-                            esp32_end = i
-                            break
-            
-            if esp32_start is not None:
-                if esp32_end is None:
-                    esp32_end = len(lines)
-                    for i in range(esp32_start + 1, len(lines)):
-                        line = lines[i].strip()
-                        if '.name=' in line and not line.startswith('esp32.') and not line.startswith('#'):
-                            esp32_end = i
-                            break
-                
-                # Extract esp32 section
-                esp32_section = lines[esp32_start:esp32_end]
-                
-                # Create nuttyfi32 section
-                nuttyfi32_section = []
-                nuttyfi32_section.append("")
-                nuttyfi32_section.append("##############################################################")
-                nuttyfi32_section.append("# nuttyfi32 Dev Module")
-                nuttyfi32_section.append("##############################################################")
-                nuttyfi32_section.append("")
-                
-                for line in esp32_section:
-                    if line.strip().startswith('esp32.'):
-                        nuttyfi32_line = line.replace('esp32.', 'nuttyfi32.', 1)
-                        nuttyfi32_section.append(nuttyfi32_line)
-                    elif line.strip() == '' or line.strip().startswith('#'):
-                        nuttyfi32_section.append(line)
-                
-                # Insert nuttyfi32 section after esp32 section
-                lines[esp32_end:esp32_end] = nuttyfi32_section
-                print(f"    ✓ Added nuttyfi32 board entry to boards.txt")
-            
-            content = '\n'.join(lines)
+        content = patch_bsp_file_content(file_name, content)
         
         # Write updated content
         if content != original_content:
@@ -360,8 +388,72 @@ def rename_esp32_to_nuttyfi32(directory):
                 f.write(content)
             print(f"    ✓ Updated: {file_name}")
 
+class HashingFile:
+    """Write-only file wrapper that SHA-256 hashes bytes as they are written"""
+    
+    def __init__(self, fp):
+        self._fp = fp
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+    
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self._fp.write(data)
+    
+    def tell(self):
+        return self.size
+    
+    def flush(self):
+        self._fp.flush()
+
+def scan_files(path, prefix):
+    """Yield (path, prefix + relative name) for every non-hidden file below path, in os.walk order"""
+    # Arcnames are built by string concatenation instead of Path objects and
+    # relative_to per file; hidden names are skipped straight off the DirEntry
+    files = []
+    dirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir():
+                # Like os.walk: symlinked directories are not descended into
+                if not entry.is_symlink():
+                    dirs.append(entry)
+            else:
+                files.append((entry.path, prefix + entry.name))
+    yield from files
+    for entry in dirs:
+        yield from scan_files(entry.path, f"{prefix}{entry.name}/")
+
+def compress_zip_entry(task):
+    """Read and DEFLATE one file for the ZIP (runs in a worker process)"""
+    file_path, arcname = task
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    with open(file_path, "rb") as f:
+        data = f.read()
+    # Same raw DEFLATE stream ZipFile.write would produce at this level
+    compressor = zlib.compressobj(ZIP_COMPRESSLEVEL, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    zinfo.compress_size = len(compressed)
+    return zinfo, compressed
+
+def write_compressed_entry(zipf, zinfo, compressed):
+    """Append an already-compressed member to an open ZipFile"""
+    zinfo.header_offset = zipf.fp.tell()
+    zipf.fp.write(zinfo.FileHeader())
+    zipf.fp.write(compressed)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    # Central directory is written at start_dir when the ZipFile closes
+    zipf.start_dir = zipf.fp.tell()
+
 def create_zip(source_dir, output_zip):
-    """Create ZIP file from directory - ensures single root folder for Arduino IDE"""
+    """Create ZIP file from directory - ensures single root folder for Arduino IDE, returns (SHA-256, size)"""
     print(f"  Creating ZIP: {output_zip.name}...")
     
     # Remove existing ZIP if it exists
@@ -372,22 +464,160 @@ def create_zip(source_dir, output_zip):
     # Arduino IDE requires single root folder in ZIP
     root_folder_name = source_dir.name
     
+    # Ensure all files are under single root folder
+    tasks = scan_files(str(source_dir), f"{root_folder_name}/")
+    
+    # Files are DEFLATEd on all CPU cores; the main process appends the
+    # finished members in walk order. tasks is consumed lazily, so workers
+    # start compressing the first batches while the walk is still running.
+    # The archive is hashed while it is written, so update_json_with_zip_info
+    # does not have to read it back
     file_count = 0
-    with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(source_dir):
-            # Skip hidden files
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            files = [f for f in files if not f.startswith('.')]
-            
-            for file in files:
-                file_path = Path(root) / file
-                # Ensure all files are under single root folder
-                relative_path = file_path.relative_to(source_dir)
+    with open(output_zip, 'wb') as raw:
+        out = HashingFile(raw)
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL) as zipf:
+            with ProcessPoolExecutor() as executor:
+                for zinfo, compressed in executor.map(compress_zip_entry, tasks, chunksize=32):
+                    write_compressed_entry(zipf, zinfo, compressed)
+                    file_count += 1
+    
+    # Save hash for future comparison
+    save_zip_hash()
+    
+    print(f"  ✓ ZIP created: {output_zip.name} ({file_count} files)")
+    print(f"    Root folder in ZIP: {root_folder_name}/")
+    return out.sha256.hexdigest().upper(), str(out.size)
+
+def release_zinfo(info, arcname):
+    """ZipInfo for arcname carrying over the release member's timestamp and permissions"""
+    zinfo = zipfile.ZipInfo(arcname, date_time=info.date_time)
+    zinfo.create_system = info.create_system
+    zinfo.external_attr = info.external_attr
+    return zinfo
+
+def read_raw_entry(fp, info, arcname):
+    """Read a release ZIP member's compressed bytes as stored, without inflating them"""
+    # Data follows the 30-byte local header plus its own name/extra fields,
+    # which may differ in length from the central directory's
+    fp.seek(info.header_offset)
+    header = fp.read(zipfile.sizeFileHeader)
+    if header[:4] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    name_len, extra_len = struct.unpack_from('<HH', header, 26)
+    fp.seek(name_len + extra_len, os.SEEK_CUR)
+    compressed = fp.read(info.compress_size)
+    zinfo = release_zinfo(info, arcname)
+    zinfo.compress_type = info.compress_type
+    zinfo.file_size = info.file_size
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = len(compressed)
+    return zinfo, compressed
+
+def compress_release_entry(task):
+    """Read one member of the release ZIP and DEFLATE it (runs in a worker thread)"""
+    src, info, arcname, data = task
+    zinfo = release_zinfo(info, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    if data is None:
+        # ZipFile reads are thread-safe; inflating runs without the GIL
+        data = src.read(info)
+    compressor = zlib.compressobj(ZIP_COMPRESSLEVEL, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    zinfo.compress_size = len(compressed)
+    return zinfo, compressed
+
+def patch_release_file(file_name, data):
+    """Apply patch_bsp_file_content to raw bytes read like a text-mode file"""
+    # Same newline handling as open(..., 'r') / open(..., 'w') in rename_esp32_to_nuttyfi32
+    content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    new_content = patch_bsp_file_content(file_name, content)
+    if new_content == content:
+        return data
+    print(f"    ✓ Updated: {file_name}")
+    return new_content.replace('\n', os.linesep).encode('utf-8')
+
+def create_zip_from_release(release_zip, output_zip):
+    """Create the nuttyfi32 ZIP straight from the release ZIP (no extraction), returns (SHA-256, size)"""
+    print(f"  Creating ZIP: {output_zip.name} from {release_zip.name}...")
+    
+    # Remove existing ZIP if it exists
+    if output_zip.exists():
+        output_zip.unlink()
+        print("    ✓ Deleted old ZIP file")
+    
+    with zipfile.ZipFile(release_zip, 'r') as src:
+        infos = src.infolist()
+        
+        # Same single root folder extract_zip would produce: keep a lone
+        # top-level folder, otherwise wrap everything in nuttyfi32_bsp/
+        top_items = {info.filename.split('/', 1)[0] for info in infos}
+        top_folders = {info.filename.split('/', 1)[0] for info in infos if '/' in info.filename}
+        if not top_items:
+            raise FileNotFoundError("No content found in extracted ZIP!")
+        if len(top_folders) == 1 and top_items == top_folders:
+            root_folder_name = next(iter(top_folders))
+            strip = len(root_folder_name) + 1
+        else:
+            root_folder_name = "nuttyfi32_bsp"
+            strip = 0
+        
+        # Relative path (below the root folder) -> member, skipping hidden
+        # files/folders and directory entries like create_zip does
+        members = {}
+        for info in infos:
+            relative_path = info.filename[strip:]
+            if info.is_dir() or not relative_path:
+                continue
+            if any(part.startswith('.') for part in relative_path.split('/')):
+                continue
+            members[relative_path] = info
+        
+        print("  Renaming esp32 to nuttyfi32...")
+        if ESP32_PACKAGE_TEMPLATE in members:
+            members.pop(NUTTYFI32_PACKAGE_TEMPLATE, None)
+            print(f"    ✓ Renamed: package_esp32_index.template.json -> package_nuttyfi32_index.template.json")
+        
+        file_count = 0
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor, \
+                open(release_zip, 'rb') as raw_src, open(output_zip, 'wb') as raw:
+            # Only the key files are read and patched here. Other stored or
+            # DEFLATEd members are copied compressed as they are; anything
+            # else (encrypted, bzip2, lzma) is inflated and DEFLATEd by the pool
+            jobs = []
+            for relative_path, info in members.items():
+                data = None
+                if relative_path in BSP_PATCHED_FILES:
+                    data = patch_release_file(relative_path, src.read(info))
+                if relative_path == ESP32_PACKAGE_TEMPLATE:
+                    relative_path = NUTTYFI32_PACKAGE_TEMPLATE
                 arcname = f"{root_folder_name}/{relative_path}"
-                zipf.write(file_path, arcname)
-                file_count += 1
+                if (data is None and not info.flag_bits & 0x1
+                        and info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)):
+                    jobs.append((info, arcname))
+                else:
+                    jobs.append(executor.submit(compress_release_entry, (src, info, arcname, data)))
+            
+            out = HashingFile(raw)
+            with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL) as zipf:
+                for job in jobs:
+                    if isinstance(job, tuple):
+                        zinfo, compressed = read_raw_entry(raw_src, *job)
+                    else:
+                        zinfo, compressed = job.result()
+                    write_compressed_entry(zipf, zinfo, compressed)
+                    file_count += 1
     
     # Save hash for future comparison
+    save_zip_hash()
+    
+    print(f"  ✓ ZIP created: {output_zip.name} ({file_count} files)")
+    print(f"    Root folder in ZIP: {root_folder_name}/")
+    return out.sha256.hexdigest().upper(), str(out.size)
+
+def save_zip_hash():
+    """Store calculate_zip_hash of RELEASE_ZIP in .zip_hash"""
     source_hash = None
     if RELEASE_ZIP.exists():
         source_hash = calculate_zip_hash(RELEASE_ZIP)
@@ -395,28 +625,28 @@ def create_zip(source_dir, output_zip):
         hash_file = BASE_DIR / ".zip_hash"
         with open(hash_file, 'w') as f:
             f.write(source_hash)
-    
-    print(f"  ✓ ZIP created: {output_zip.name} ({file_count} files)")
-    print(f"    Root folder in ZIP: {root_folder_name}/")
-    return output_zip
 
-def update_json_with_zip_info():
+def update_json_with_zip_info(checksum=None, size=None):
     """Update JSON file with ZIP checksum, size, and version"""
     if not OUTPUT_ZIP.exists():
         raise FileNotFoundError(f"ZIP file not found: {OUTPUT_ZIP}")
     
-    # Calculate checksum and size
-    checksum = calculate_sha256(OUTPUT_ZIP)
-    size = str(get_file_size(OUTPUT_ZIP))
+    # Calculate checksum and size unless create_zip already streamed them
+    if checksum is None:
+        checksum = calculate_sha256(OUTPUT_ZIP)
+    if size is None:
+        size = str(get_file_size(OUTPUT_ZIP))
     
     print(f"  Checksum: SHA-256:{checksum}")
     print(f"  Size: {size} bytes ({int(size) / (1024*1024):.2f} MB)")
     
     # Read existing JSON or template
+    existing_text = None
     if JSON_OUTPUT.exists():
         # Read existing JSON to preserve tools
         with open(JSON_OUTPUT, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+            existing_text = f.read()
+        data = json.loads(existing_text)
     elif JSON_TEMPLATE.exists():
         with open(JSON_TEMPLATE, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -432,13 +662,54 @@ def update_json_with_zip_info():
     platform['checksum'] = f"SHA-256:{checksum}"
     platform['size'] = size
     
-    # Write JSON
-    with open(JSON_OUTPUT, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    # Write JSON, unless it already has exactly this content (e.g. the ZIP was
+    # rebuilt byte-identical) - keeps its mtime and git status untouched
+    new_text = json.dumps(data, indent=2)
+    if new_text == existing_text:
+        print(f"  ✓ JSON already up to date: {JSON_OUTPUT.name}")
+        return checksum, size
+    # Temp file + os.replace: a hardlink left by an older sync is never written
+    # through, and a crash mid-write cannot leave a truncated index
+    tmp_json = JSON_OUTPUT.with_name(JSON_OUTPUT.name + ".tmp")
+    with open(tmp_json, 'w', encoding='utf-8') as f:
+        f.write(new_text)
+    os.replace(tmp_json, JSON_OUTPUT)
     
     print(f"  ✓ JSON updated: {JSON_OUTPUT.name}")
     return checksum, size
 
+def link_or_copy(src, dst):
+    """Hardlink src to dst, copying instead when linking fails (e.g. cross-device)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def sync_bsp_item(item):
+    """Replace BASE_DIR/<name> with a hardlinked copy of one BSP_SOURCE item, returns files synced"""
+    dest = BASE_DIR / item.name
+    
+    # Remove existing if it exists (except arduino-esp32-master folder itself)
+    if dest.exists() and dest != BSP_SOURCE:
+        if dest.is_dir():
+            shutil.rmtree(dest)
+        else:
+            dest.unlink()
+    
+    # Hardlink into root - same bytes as arduino-esp32-master, no data copied
+    if item.is_dir():
+        # Count non-hidden files as copytree links them - no second walk of dest
+        file_count = 0
+        def link_and_count(src, dst):
+            nonlocal file_count
+            link_or_copy(src, dst)
+            if not os.path.basename(dst).startswith('.'):
+                file_count += 1
+        shutil.copytree(item, dest, copy_function=link_and_count)
+        return file_count
+    link_or_copy(item, dest)
+    return 1
+
 def push_bsp_to_github():
     """Push arduino-esp32-master to GitHub Master branch"""
     token = get_token()
@@ -450,40 +721,23 @@ def push_bsp_to_github():
     if not BSP_SOURCE.exists():
         ensure_bsp_source_folder()
     
-    # Configure git
-    run_git(["config", "http.postBuffer", "524288000"], allow_failure=True)
-    run_git(["config", "http.timeout", "600"], allow_failure=True)
+    # Configure git (the http.* settings are passed to the push itself with -c,
+    # saving two git config processes per run)
     run_git(["remote", "set-url", "origin", repo_url])
     
     # Copy all contents from arduino-esp32-master to root (not the folder itself)
     print("  Syncing files from arduino-esp32-master to root...")
-    file_count = 0
+    items = [
+        item for item in BSP_SOURCE.iterdir()
+        # Skip hidden items, script files and ZIPs, and the BSP's own copy of
+        # the generated JSON (it would replace the updated one in root)
+        if not item.name.startswith('.') and not item.name.endswith(('.bat', '.py', '.zip'))
+        and item.name != JSON_OUTPUT.name
+    ]
     
-    for item in BSP_SOURCE.iterdir():
-        if item.name.startswith('.'):
-            continue
-        
-        dest = BASE_DIR / item.name
-        
-        # Skip if it's a script file or ZIP
-        if item.name.endswith(('.bat', '.py', '.zip')):
-            continue
-        
-        # Remove existing if it exists (except arduino-esp32-master folder itself)
-        if dest.exists() and dest != BSP_SOURCE:
-            if dest.is_dir():
-                shutil.rmtree(dest)
-            else:
-                dest.unlink()
-        
-        # Copy to root
-        if item.is_dir():
-            shutil.copytree(item, dest)
-            for root, dirs, files in os.walk(dest):
-                file_count += len([f for f in files if not f.startswith('.')])
-        else:
-            shutil.copy2(item, dest)
-            file_count += 1
+    # Top-level items are independent, so their remove/link work overlaps
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        file_count = sum(executor.map(sync_bsp_item, items))
     
     print(f"  Synced {file_count} files to root level")
     
@@ -493,10 +747,13 @@ def push_bsp_to_github():
     exclude_items = {'arduino-esp32-master', '.git', '.github_token', 'temp_build'}
     exclude_extensions = {'.bat', '.zip'}
     
+    # Paths are collected first and staged by a single git add below
+    # instead of one git process per item
+    to_add = []
+    
     # Add JSON file explicitly
     if JSON_OUTPUT.exists():
-        run_git(["add", "-f", JSON_OUTPUT.name], allow_failure=True, capture_output=True)
-        print(f"    ✓ Added: {JSON_OUTPUT.name}")
+        to_add.append(JSON_OUTPUT.name)
     
     # Add all BSP files from root (only if they exist and are not excluded)
     added_count = 0
@@ -508,15 +765,18 @@ def push_bsp_to_github():
         if item.name == JSON_OUTPUT.name:
             continue
         
-        # Only add if file/dir exists and is not already in git or has changes
-        if item.is_file():
-            result = run_git(["add", "-f", item.name], allow_failure=True, capture_output=True)
-            if result.returncode == 0:
-                added_count += 1
-        elif item.is_dir():
-            result = run_git(["add", "-f", f"{item.name}/"], allow_failure=True, capture_output=True)
-            if result.returncode == 0:
-                added_count += 1
+        if item.is_file() or item.is_dir():
+            to_add.append(item.name)
+            added_count += 1
+    
+    if to_add:
+        # NUL-separated literal pathspecs on stdin; --ignore-errors keeps
+        # going past unreadable files like the old per-item adds did
+        run_git(["--literal-pathspecs", "add", "-f", "--ignore-errors",
+                 "--pathspec-from-file=-", "--pathspec-file-nul"],
+                allow_failure=True, capture_output=True, input="\0".join(to_add))
+        if JSON_OUTPUT.exists():
+            print(f"    ✓ Added: {JSON_OUTPUT.name}")
     
     if added_count > 0:
         print(f"    ✓ Added {added_count} items to git")
@@ -530,31 +790,35 @@ def push_bsp_to_github():
         "build_and_push_complete.py",
         "build_and_push.bat",
     ]
-    for script in auto_scripts:
-        script_path = BASE_DIR / script
-        if script_path.exists():
-            run_git(["add", script], allow_failure=True)
+    auto_scripts = [script for script in auto_scripts if (BASE_DIR / script).exists()]
+    if auto_scripts:
+        run_git(["--literal-pathspecs", "add", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                allow_failure=True, input="\0".join(auto_scripts))
+        for script in auto_scripts:
             print(f"    ✓ Forced add: {script}")
     
-    # Check if there are any staged changes to commit
-    result = run_git(["diff", "--cached", "--name-only"], capture_output=True)
-    staged_files = result.stdout.strip().split('\n')
-    staged_files = [f for f in staged_files if f.strip()]
-    
-    if not staged_files:
-        print("  ℹ️  No changes to commit - everything is up to date")
-        return file_count
-    
-    print(f"  ✓ {len(staged_files)} files staged for commit")
+    # Commit straight away - git commit itself fails when nothing is staged,
+    # so no separate git diff --cached is needed for the usual case
+    result = run_git(["commit", "-q", "-m", f"Update nuttyfi32 BSP v{VERSION} - auto build"],
+                     allow_failure=True, capture_output=True)
+    if result.returncode != 0:
+        # Only a real failure if something was staged (works in any git locale)
+        if run_git(["diff", "--cached", "--quiet"], allow_failure=True).returncode == 0:
+            print("  ℹ️  No changes to commit - everything is up to date")
+            return file_count
+        raise RuntimeError(
+            f"git commit failed (code {result.returncode})\n"
+            f"STDOUT:\n{result.stdout.strip()}\nSTDERR:\n{result.stderr.strip()}"
+        )
     
-    # Commit
-    run_git(["commit", "-m", f"Update nuttyfi32 BSP v{VERSION} - auto build"])
+    print("  ✓ Changes committed")
     
     # Push
     print("  ⚠️  Pushing to GitHub (this will take time)...")
     print("  Please wait, do NOT close this window...")
     
-    result = run_git(["push", "origin", GITHUB_BRANCH], capture_output=True, timeout=1800)
+    result = run_git(["-c", "http.postBuffer=524288000", "-c", "http.timeout=600",
+                      "push", "origin", GITHUB_BRANCH], capture_output=True, timeout=1800)
     if result.stdout.strip():
         print(result.stdout.strip())
     if result.stderr.strip():
@@ -578,21 +842,8 @@ def main():
     total_tasks = 7
     task_idx = 1
     
-    # Clean temp directory
-    if TEMP_DIR.exists():
-        shutil.rmtree(TEMP_DIR)
-    TEMP_DIR.mkdir()
-    
     try:
-        # Task 1: Sync with GitHub
-        print_task_status(task_idx, total_tasks, "Sync with GitHub", "RUNNING")
-        ensure_git_ready()
-        sync_with_remote()
-        print_task_status(task_idx, total_tasks, "Sync with GitHub", "SUCCESS", "Local branch in sync with origin")
-        tasks_completed += 1
-        task_idx += 1
-
-        # Task 1: Check if ZIP needs update
+        # Task 1: Check if ZIP needs update (local stats and hashing only)
         print_task_status(task_idx, total_tasks, "Check if ZIP needs update", "RUNNING")
         zip_needs_update = check_if_zip_needs_update()
         if zip_needs_update:
@@ -603,7 +854,25 @@ def main():
         tasks_completed += 1
         task_idx += 1
         
+        # Task 2: Sync with GitHub - skipped when neither the ZIP, the tracked
+        # files nor origin changed (one ls-remote instead of fetch + pull)
+        print_task_status(task_idx, total_tasks, "Sync with GitHub", "RUNNING")
+        ensure_git_ready()
+        if not zip_needs_update and is_in_sync_with_remote():
+            detail = "Nothing changed - HEAD already matches origin"
+        else:
+            sync_with_remote()
+            detail = "Local branch in sync with origin"
+        print_task_status(task_idx, total_tasks, "Sync with GitHub", "SUCCESS", detail)
+        tasks_completed += 1
+        task_idx += 1
+        
         if zip_needs_update:
+            # Clean temp directory
+            if TEMP_DIR.exists():
+                shutil.rmtree(TEMP_DIR)
+            TEMP_DIR.mkdir()
+            
             # Task 3: Delete old ZIP files
             print_task_status(task_idx, total_tasks, "Delete old ZIP files", "RUNNING")
             deleted = delete_old_zips()
@@ -613,16 +882,26 @@ def main():
             
             # Task 4: Prepare source and rename
             print_task_status(task_idx, total_tasks, "Prepare BSP source", "RUNNING")
-            work_dir = prepare_bsp_source()
-            rename_esp32_to_nuttyfi32(work_dir)
-            print_task_status(task_idx, total_tasks, "Prepare BSP source", "SUCCESS", "Source ready")
+            if RELEASE_ZIP.exists():
+                # The release ZIP is read and patched while building the
+                # nuttyfi32 ZIP - nothing is extracted to disk
+                work_dir = None
+                detail = f"Reading {RELEASE_ZIP.name} directly"
+            else:
+                work_dir = prepare_bsp_source()
+                rename_esp32_to_nuttyfi32(work_dir)
+                detail = "Source ready"
+            print_task_status(task_idx, total_tasks, "Prepare BSP source", "SUCCESS", detail)
             tasks_completed += 1
             task_idx += 1
             
             # Task 5: Create nuttyfi32 ZIP
             print_task_status(task_idx, total_tasks, "Create nuttyfi32 ZIP", "RUNNING")
-            create_zip(work_dir, OUTPUT_ZIP)
-            zip_size = get_file_size(OUTPUT_ZIP) / (1024 * 1024)  # MB
+            if work_dir is None:
+                zip_checksum, zip_bytes = create_zip_from_release(RELEASE_ZIP, OUTPUT_ZIP)
+            else:
+                zip_checksum, zip_bytes = create_zip(work_dir, OUTPUT_ZIP)
+            zip_size = int(zip_bytes) / (1024 * 1024)  # MB
             print_task_status(task_idx, total_tasks, "Create nuttyfi32 ZIP", "SUCCESS", 
                              f"Created {OUTPUT_ZIP.name} ({zip_size:.2f} MB)")
             tasks_completed += 1
@@ -630,7 +909,7 @@ def main():
             
             # Task 6: Update JSON with checksum and size
             print_task_status(task_idx, total_tasks, "Update JSON with checksum and size", "RUNNING")
-            checksum, size = update_json_with_zip_info()
+            checksum, size = update_json_with_zip_info(zip_checksum, zip_bytes)
             print_task_status(task_idx, total_tasks, "Update JSON with checksum and size", "SUCCESS",
                              f"Checksum: SHA-256:{checksum[:16]}..., Size: {int(size) / (1024*1024):.2f} MB")
             tasks_completed += 1
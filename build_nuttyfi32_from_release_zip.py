@@ -11,12 +11,17 @@ This script:
 """
 
 import os
+import re
 import json
+import zlib
 import zipfile
 import shutil
+import functools
 import hashlib
+import posixpath
 import subprocess
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # ==================== CONFIGURATION ====================
 VERSION = "1.0.0"
@@ -28,30 +33,52 @@ JSON_TEMPLATE = BASE_DIR / "package" / "package_nuttyfi32_index.template.json"
 JSON_OUTPUT = BASE_DIR / "package_nuttyfi32_index.json"
 TEMP_DIR = BASE_DIR / "temp_build"
 GITHUB_BRANCH = "Master"
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB read buffer for hashing
+EXTRACT_BUFFER_SIZE = 1024 * 1024  # Max copy buffer per extracted file
+ZIP_COMPRESSLEVEL = 1  # zlib level 1: several times faster than default 6, slightly larger ZIP
+# Already compressed / incompressible files are stored as-is instead of DEFLATEd
+STORED_EXTENSIONS = {'.bin', '.img', '.gz', '.zip', '.xz', '.zst', '.7z', '.bz2', '.png', '.jpg', '.jpeg',
+                     '.woff2', '.pdf', '.exe', '.dll'}
+
+# platform.txt: first name= line mentioning ESP32
+PLATFORM_NAME_RE = re.compile(r'^name=[^\n]*ESP32[^\n]*$', re.M)
+# boards.txt: "esp32.name=ESP32 Dev Module" and the esp32.*, comment and blank lines after it
+ESP32_BOARD_RE = re.compile(r'^[^\S\n]*esp32\.name=ESP32 Dev Module[^\S\n]*$'
+                            r'(?:\n[^\S\n]*(?:(?:esp32\.|#)[^\n]*)?$)*', re.M)
+ESP32_PREFIX_RE = re.compile(r'^([^\S\n]*)esp32\.', re.M)
 # =======================================================
 
 def calculate_sha256(file_path):
     """Calculate SHA-256 checksum"""
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+        # file_digest (Python 3.11+) runs the read/hash loop in C
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest().upper()
+        # Older Pythons: 1 MiB reads into one reusable buffer
+        sha256_hash = hashlib.sha256()
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
     return sha256_hash.hexdigest().upper()
 
 def get_file_size(file_path):
     """Get file size in bytes"""
     return os.path.getsize(file_path)
 
+@functools.lru_cache(maxsize=1)
 def get_token():
-    """Get token from .github_token file"""
-    config_file = BASE_DIR / ".github_token"
-    if config_file.exists():
-        try:
-            with open(config_file, 'r') as f:
-                return f.read().strip()
-        except:
-            pass
-    return None
+    """Get token from .github_token file (read once per run)"""
+    # Just open it - a missing file raises FileNotFoundError, so no separate
+    # exists() check that could race with the open
+    try:
+        with open(BASE_DIR / ".github_token", 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
 
 def print_task_status(task_num, total, task_name, status, details=""):
     """Print task status"""
@@ -61,17 +88,62 @@ def print_task_status(task_num, total, task_name, status, details=""):
     if details:
         print(f"  └─ {details}")
 
+def extract_member(zip_ref, info, extract_to):
+    """Extract one ZIP member with a buffer sized to the file, creating empty files directly"""
+    # Same sanitising as ZipFile.extract: no drive, no absolute or '..' parts
+    name = os.path.splitdrive(info.filename.replace('\\', '/'))[1]
+    parts = [p for p in name.split('/') if p not in ('', '.', '..')]
+    if not parts:
+        return
+    dest = extract_to.joinpath(*parts)
+    if info.is_dir():
+        dest.mkdir(parents=True, exist_ok=True)
+        return
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if info.file_size == 0:
+        open(dest, "wb").close()
+        return
+    with zip_ref.open(info) as src, open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst, min(info.file_size, EXTRACT_BUFFER_SIZE))
+
+def extract_members(zip_path, infos, extract_to):
+    """Extract a batch of ZIP members through a private ZipFile (runs in a worker thread)"""
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for info in infos:
+            extract_member(zip_ref, info, extract_to)
+
 def extract_zip(zip_path, extract_to):
     """Extract ZIP file and return work directory"""
     print(f"  Extracting {zip_path.name}...")
+    # Directory entries are created here; files are grouped by folder so no
+    # two threads ever race to create the same directory
+    folders = {}
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_to)
+        for info in zip_ref.infolist():
+            if info.is_dir():
+                extract_member(zip_ref, info, extract_to)
+            else:
+                folders.setdefault(posixpath.dirname(info.filename), []).append(info)
+    
+    # A ZipFile handle is not safe to share, so each thread opens its own;
+    # inflate and file writes release the GIL
+    workers = os.cpu_count() or 4
+    batches = [[] for _ in range(workers)]
+    for i, infos in enumerate(sorted(folders.values(), key=len, reverse=True)):
+        batches[i % workers].extend(infos)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(extract_members, zip_path, batch, extract_to)
+                   for batch in batches if batch]
+        for future in futures:
+            future.result()
     print("  ✓ Extraction complete!")
     
-    # Find extracted folder(s)
-    extracted_items = list(extract_to.iterdir())
-    extracted_folders = [d for d in extracted_items if d.is_dir()]
-    extracted_files = [f for f in extracted_items if f.is_file()]
+    # Find extracted folder(s) - DirEntry caches the file type, so the
+    # is_dir()/is_file() checks need no extra stat calls
+    with os.scandir(extract_to) as it:
+        extracted_items = list(it)
+    extracted_folders = [Path(d.path) for d in extracted_items if d.is_dir()]
+    extracted_files = [Path(f.path) for f in extracted_items if f.is_file()]
     
     # If multiple top-level items, wrap in a single folder
     if len(extracted_folders) > 1 or (extracted_folders and extracted_files):
@@ -81,11 +153,7 @@ def extract_zip(zip_path, extract_to):
         
         # Move all items into wrapper
         for item in extracted_items:
-            dest = wrapper_dir / item.name
-            if item.is_dir():
-                shutil.move(str(item), str(dest))
-            else:
-                shutil.move(str(item), str(dest))
+            shutil.move(item.path, str(wrapper_dir / item.name))
         
         print(f"  ✓ Wrapped in single root folder: {wrapper_dir.name}/")
         return wrapper_dir
@@ -141,63 +209,26 @@ def rename_esp32_to_nuttyfi32(directory):
         
         # Update platform.txt
         if file_name == "platform.txt":
-            lines = content.split('\n')
-            for i, line in enumerate(lines):
-                if line.startswith('name=') and 'ESP32' in line:
-                    lines[i] = 'name=nuttyfi32 Arduino'
-                    break
-            content = '\n'.join(lines)
+            # One C-level regex pass instead of splitting the file into lines
+            content = PLATFORM_NAME_RE.sub('name=nuttyfi32 Arduino', content, count=1)
         
         # Update boards.txt - add nuttyfi32 board
         if file_name == "boards.txt":
-            lines = content.split('\n')
-            
-            # Find esp32.name line
-            esp32_start = None
-            esp32_end = None
-            for i, line in enumerate(lines):
-                if line.strip() == "esp32.name=ESP32 Dev Module" and esp32_start is None:
-                    esp32_start = i
-                elif esp32_start is not None and esp32_end is None:
-                    # Find end of esp32 section
-                    if line.strip() and not line.strip().startswith('esp32.') and not line.strip().startswith('#') and not line.strip() == '':
-                        if not line.strip().startswith('esp32.menu.'):
-                            esp32_end = i
-                            break
-            
-            if esp32_start is not None:
-                # Find actual end
-                if esp32_end is None:
-                    esp32_end = len(lines)
-                    for i in range(esp32_start + 1, len(lines)):
-                        line = lines[i].strip()
-                        if '.name=' in line and not line.startswith('esp32.') and not line.startswith('#'):
-                            esp32_end = i
-                            break
-                
-                # Extract esp32 section
-                esp32_section = lines[esp32_start:esp32_end]
-                
-                # Create nuttyfi32 section
-                nuttyfi32_section = []
-                nuttyfi32_section.append("")
-                nuttyfi32_section.append("##############################################################")
-                nuttyfi32_section.append("# nuttyfi32 Dev Module")
-                nuttyfi32_section.append("##############################################################")
-                nuttyfi32_section.append("")
-                
-                for line in esp32_section:
-                    if line.strip().startswith('esp32.'):
-                        nuttyfi32_line = line.replace('esp32.', 'nuttyfi32.', 1)
-                        nuttyfi32_section.append(nuttyfi32_line)
-                    elif line.strip() == '' or line.strip().startswith('#'):
-                        nuttyfi32_section.append(line)
-                
+            # ESP32 Dev Module section: its name line plus every following
+            # esp32.* / comment / blank line, found in one regex pass
+            match = ESP32_BOARD_RE.search(content)
+            if match:
+                nuttyfi32_section = "\n".join([
+                    "",
+                    "##############################################################",
+                    "# nuttyfi32 Dev Module",
+                    "##############################################################",
+                    "",
+                    ESP32_PREFIX_RE.sub(r"\1nuttyfi32.", match.group(0)),
+                ])
                 # Insert nuttyfi32 section after esp32 section
-                lines[esp32_end:esp32_end] = nuttyfi32_section
+                content = content[:match.end()] + "\n" + nuttyfi32_section + content[match.end():]
                 print(f"    ✓ Added nuttyfi32 board entry to boards.txt")
-            
-            content = '\n'.join(lines)
         
         # Write updated content
         if content != original_content:
@@ -205,8 +236,74 @@ def rename_esp32_to_nuttyfi32(directory):
                 f.write(content)
             print(f"    ✓ Updated: {file_name}")
 
+class HashingFile:
+    """Write-only file wrapper that SHA-256 hashes bytes as they are written"""
+    
+    def __init__(self, fp):
+        self._fp = fp
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+    
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self._fp.write(data)
+    
+    def tell(self):
+        return self.size
+    
+    def flush(self):
+        self._fp.flush()
+
+def compress_zip_entry(task):
+    """Read and compress one file for the ZIP (runs in a worker process)"""
+    file_path, arcname = task
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    with open(file_path, "rb") as f:
+        data = f.read()
+    if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+        # DEFLATE would only burn CPU on already compressed data
+        zinfo.compress_type = zipfile.ZIP_STORED
+        compressed = data
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        # Same raw DEFLATE stream ZipFile.write would produce at this level
+        compressor = zlib.compressobj(ZIP_COMPRESSLEVEL, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    zinfo.compress_size = len(compressed)
+    return zinfo, compressed
+
+def write_compressed_entry(zipf, zinfo, compressed):
+    """Append an already-compressed member to an open ZipFile"""
+    zinfo.header_offset = zipf.fp.tell()
+    zipf.fp.write(zinfo.FileHeader())
+    zipf.fp.write(compressed)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    # Central directory is written at start_dir when the ZipFile closes
+    zipf.start_dir = zipf.fp.tell()
+
+def walk_zip_tasks(source_dir, root_folder_name):
+    """Yield (file path, arcname) for every non-hidden file below source_dir"""
+    # Arcnames are sliced out of the joined path string instead of building
+    # a Path and calling relative_to for every file
+    source_str = str(source_dir)
+    prefix_len = len(source_str) + 1
+    for root, dirs, files in os.walk(source_str):
+        # Skip hidden files
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        
+        for file in files:
+            if file.startswith('.'):
+                continue
+            file_path = os.path.join(root, file)
+            # Ensure all files are under single root folder
+            yield file_path, f"{root_folder_name}/{file_path[prefix_len:].replace(os.sep, '/')}"
+
 def create_zip(source_dir, output_zip):
-    """Create ZIP file from directory - ensures single root folder for Arduino IDE"""
+    """Create ZIP file from directory - ensures single root folder for Arduino IDE, returns (SHA-256, size)"""
     print(f"  Creating ZIP: {output_zip.name}...")
     
     # Remove old ZIP if exists
@@ -217,33 +314,34 @@ def create_zip(source_dir, output_zip):
     # Use source_dir name as root folder name
     root_folder_name = source_dir.name
     
+    # Files are DEFLATEd on all CPU cores; the main process appends the
+    # finished members in walk order, so the archive matches a serial build.
+    # Every byte is hashed on its way to disk, so the SHA-256 for the JSON
+    # needs no second pass over the finished ZIP
+    tasks = walk_zip_tasks(source_dir, root_folder_name)
     file_count = 0
-    with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(source_dir):
-            # Skip hidden files
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            files = [f for f in files if not f.startswith('.')]
-            
-            for file in files:
-                file_path = Path(root) / file
-                # Ensure all files are under single root folder
-                relative_path = file_path.relative_to(source_dir)
-                arcname = f"{root_folder_name}/{relative_path}"
-                zipf.write(file_path, arcname)
-                file_count += 1
+    with open(output_zip, 'wb') as raw:
+        out = HashingFile(raw)
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL) as zipf:
+            with ProcessPoolExecutor() as executor:
+                for zinfo, compressed in executor.map(compress_zip_entry, tasks, chunksize=32):
+                    write_compressed_entry(zipf, zinfo, compressed)
+                    file_count += 1
     
     print(f"  ✓ ZIP created: {output_zip.name} ({file_count} files)")
     print(f"    Root folder in ZIP: {root_folder_name}/")
-    return output_zip
+    return out.sha256.hexdigest().upper(), str(out.size)
 
-def update_json_with_zip_info():
+def update_json_with_zip_info(checksum=None, size=None):
     """Update JSON file with ZIP checksum, size, and version"""
     if not OUTPUT_ZIP.exists():
         raise FileNotFoundError(f"ZIP file not found: {OUTPUT_ZIP}")
     
-    # Calculate checksum and size
-    checksum = calculate_sha256(OUTPUT_ZIP)
-    size = str(get_file_size(OUTPUT_ZIP))
+    # Calculate checksum and size unless create_zip already streamed them
+    if checksum is None:
+        checksum = calculate_sha256(OUTPUT_ZIP)
+    if size is None:
+        size = str(get_file_size(OUTPUT_ZIP))
     
     print(f"  Checksum: SHA-256:{checksum}")
     print(f"  Size: {size} bytes ({int(size) / (1024*1024):.2f} MB)")
@@ -286,13 +384,24 @@ def update_json_with_zip_info():
     platform['checksum'] = f"SHA-256:{checksum}"
     platform['size'] = size
     
-    # Write JSON
-    with open(JSON_OUTPUT, 'w', encoding='utf-8') as f:
+    # Write JSON - via a temp file and os.replace, so a hardlink left by an
+    # older sync is never written through and a crash mid-write cannot leave
+    # a truncated index
+    tmp_json = JSON_OUTPUT.with_name(JSON_OUTPUT.name + ".tmp")
+    with open(tmp_json, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2)
+    os.replace(tmp_json, JSON_OUTPUT)
     
     print(f"  ✓ JSON updated: {JSON_OUTPUT.name}")
     return checksum, size
 
+def link_or_copy(src, dst):
+    """Hardlink src to dst, copying instead when linking fails (e.g. cross-device)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
 def push_bsp_to_github():
     """Push arduino-esp32-master to GitHub Master branch"""
     token = get_token()
@@ -313,32 +422,39 @@ def push_bsp_to_github():
     print("  Syncing files from arduino-esp32-master to root...")
     file_count = 0
     
-    for item in BSP_SOURCE.iterdir():
-        if item.name.startswith('.'):
-            continue
-        
-        dest = BASE_DIR / item.name
-        
-        # Skip if it's a script file or ZIP
-        if item.name.endswith(('.bat', '.py', '.zip')):
-            continue
-        
-        # Remove existing if it exists (except arduino-esp32-master folder itself)
-        if dest.exists() and dest != BSP_SOURCE:
-            if dest.is_dir():
-                shutil.rmtree(dest)
-            else:
-                dest.unlink()
-        
-        # Copy to root
-        if item.is_dir():
-            shutil.copytree(item, dest)
-            for root, dirs, files in os.walk(dest):
-                file_count += len([f for f in files if not f.startswith('.')])
-        else:
-            shutil.copy2(item, dest)
+    # Count non-hidden files as copytree links them - no second walk of dest
+    def link_and_count(src, dst):
+        nonlocal file_count
+        link_or_copy(src, dst)
+        if not os.path.basename(dst).startswith('.'):
             file_count += 1
     
+    with os.scandir(BSP_SOURCE) as it:
+        for item in it:
+            if item.name.startswith('.'):
+                continue
+            
+            dest = BASE_DIR / item.name
+            
+            # Skip if it's a script file or ZIP, and the BSP's own copy of the
+            # generated JSON (it would replace the updated one in root)
+            if item.name.endswith(('.bat', '.py', '.zip')) or item.name == JSON_OUTPUT.name:
+                continue
+            
+            # Remove existing if it exists (except arduino-esp32-master folder itself)
+            if dest.exists() and dest != BSP_SOURCE:
+                if dest.is_dir():
+                    shutil.rmtree(dest)
+                else:
+                    dest.unlink()
+            
+            # Hardlink into root - same bytes as arduino-esp32-master, no data copied
+            if item.is_dir():
+                shutil.copytree(item.path, dest, copy_function=link_and_count)
+            else:
+                link_or_copy(item.path, dest)
+                file_count += 1
+    
     print(f"  Synced {file_count} files to root level")
     
     # Add files to git
@@ -347,23 +463,35 @@ def push_bsp_to_github():
     exclude_items = {'arduino-esp32-master', '.git', '.github_token', 'temp_build'}
     exclude_extensions = {'.bat', '.py', '.zip'}
     
+    # Collect everything first and stage it with one git add,
+    # instead of one git process per item
+    to_add = []
+    
     # Add JSON file explicitly
     if JSON_OUTPUT.exists():
-        subprocess.run(["git", "add", "-f", JSON_OUTPUT.name], cwd=BASE_DIR, check=False, capture_output=True)
+        to_add.append(JSON_OUTPUT.name)
     
     # Add all BSP files from root
-    for item in BASE_DIR.iterdir():
-        if item.name in exclude_items or item.name.startswith('.'):
-            continue
-        if item.suffix in exclude_extensions:
-            continue
-        if item.name == JSON_OUTPUT.name:
-            continue
-        
-        if item.is_file():
-            subprocess.run(["git", "add", "-f", item.name], cwd=BASE_DIR, check=False, capture_output=True)
-        elif item.is_dir():
-            subprocess.run(["git", "add", "-f", f"{item.name}/"], cwd=BASE_DIR, check=False, capture_output=True)
+    with os.scandir(BASE_DIR) as it:
+        for item in it:
+            if item.name in exclude_items or item.name.startswith('.'):
+                continue
+            if os.path.splitext(item.name)[1] in exclude_extensions:
+                continue
+            if item.name == JSON_OUTPUT.name:
+                continue
+            
+            if item.is_file() or item.is_dir():
+                to_add.append(item.name)
+    
+    if to_add:
+        # NUL-separated literal pathspecs on stdin (no ARG_MAX limit);
+        # --ignore-errors keeps going past unreadable files like the old per-item adds did
+        subprocess.run(
+            ["git", "--literal-pathspecs", "add", "-f", "--ignore-errors",
+             "--pathspec-from-file=-", "--pathspec-file-nul"],
+            cwd=BASE_DIR, check=False, capture_output=True, text=True, input="\0".join(to_add)
+        )
     
     # Check if there are any changes to commit
     result = subprocess.run(["git", "status", "--porcelain"], cwd=BASE_DIR, capture_output=True, text=True)
@@ -430,15 +558,15 @@ def main():
         
         # Task 3: Create nuttyfi32 ZIP
         print_task_status(3, total_tasks, "Create nuttyfi32 ZIP", "RUNNING")
-        create_zip(work_dir, OUTPUT_ZIP)
-        zip_size = get_file_size(OUTPUT_ZIP) / (1024 * 1024)  # MB
+        zip_checksum, zip_bytes = create_zip(work_dir, OUTPUT_ZIP)
+        zip_size = int(zip_bytes) / (1024 * 1024)  # MB
         print_task_status(3, total_tasks, "Create nuttyfi32 ZIP", "SUCCESS", 
                          f"Created {OUTPUT_ZIP.name} ({zip_size:.2f} MB)")
         tasks_completed += 1
         
         # Task 4: Update JSON with checksum and size
         print_task_status(4, total_tasks, "Update JSON with checksum and size", "RUNNING")
-        checksum, size = update_json_with_zip_info()
+        checksum, size = update_json_with_zip_info(zip_checksum, zip_bytes)
         print_task_status(4, total_tasks, "Update JSON with checksum and size", "SUCCESS",
                          f"Checksum: SHA-256:{checksum[:16]}..., Size: {int(size) / (1024*1024):.2f} MB")
         tasks_completed += 1
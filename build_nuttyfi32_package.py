@@ -10,11 +10,18 @@ This script:
 """
 
 import os
+import re
 import json
+import mmap
+import zlib
 import zipfile
 import shutil
+import uuid
 import hashlib
+import posixpath
+import threading
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Configuration
 VERSION = "1.0.0"
@@ -24,12 +31,34 @@ ZIP_SOURCE = BASE_DIR / "esp32-1.0.6.zip"
 OUTPUT_ZIP = BASE_DIR / f"nuttyfi32-{VERSION}.zip"
 JSON_FILE = BASE_DIR / "package_nuttyfi32_index.json"
 TEMP_DIR = BASE_DIR / "temp_build"
+BUILD_CACHE = BASE_DIR / ".nuttyfi32.cache.json"  # source fingerprint + SHA-256 of the last OUTPUT_ZIP
+TRASH_PREFIX = ".trash."  # temp trees renamed to this prefix are deleted in the background
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB read buffer for hashing
+ZIP_COMPRESSLEVEL = 1  # zlib level 1: several times faster than default 6, slightly larger ZIP
+ZIP_MMAP_THRESHOLD = 64 * 1024  # files this big are mapped instead of read() into memory
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)  # timestamp of every ZIP member, for reproducible builds
+
+# boards.txt: "esp32.name=ESP32 Dev Module" and the esp32.*, comment and blank lines after it
+ESP32_BOARD_RE = re.compile(r'^[^\S\n]*esp32\.name=ESP32 Dev Module[^\S\n]*$'
+                            r'(?:\n[^\S\n]*(?:(?:esp32\.|#)[^\n]*)?$)*', re.M)
+ESP32_PREFIX_RE = re.compile(r'^([^\S\n]*)esp32\.', re.M)
+# Present once rename_esp32_to_nuttyfi32 has patched the file
+PATCHED_MARKERS = {
+    "platform.txt": b"name=nuttyfi32 Arduino",
+    "boards.txt": b"nuttyfi32.name=",
+}
 
 def calculate_sha256(file_path):
     """Calculate SHA-256 checksum of a file"""
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
+        # Sequential read hint for kernel readahead (not available on Windows)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        # file_digest (Python 3.11+) hashes in C with a large buffer
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest().upper()
+        sha256_hash = hashlib.sha256()
+        while byte_block := f.read(HASH_CHUNK_SIZE):
             sha256_hash.update(byte_block)
     return sha256_hash.hexdigest().upper()
 
@@ -37,13 +66,86 @@ def get_file_size(file_path):
     """Get file size in bytes"""
     return os.path.getsize(file_path)
 
+def link_or_copy(src, dst):
+    """Hardlink src to dst, copying instead when linking fails (e.g. cross-device)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+cleanup_threads = []
+
+def remove_in_background(path):
+    """Delete a directory tree on a background thread (joined by wait_for_cleanup)"""
+    thread = threading.Thread(target=shutil.rmtree, args=(path,), kwargs={'ignore_errors': True})
+    thread.start()
+    cleanup_threads.append(thread)
+
+def wait_for_cleanup():
+    """Block until every background delete has finished"""
+    while cleanup_threads:
+        cleanup_threads.pop().join()
+
+def discard_dir(path):
+    """Rename a directory out of the way (O(1)) and delete it in the background"""
+    trash = path.with_name(f"{TRASH_PREFIX}{path.name}.{uuid.uuid4().hex}")
+    try:
+        os.replace(path, trash)
+    except OSError:
+        # e.g. a file inside is still open on Windows
+        shutil.rmtree(path)
+        return
+    remove_in_background(trash)
+
+def extract_members(zip_path, infos, extract_to):
+    """Extract a batch of ZIP members through a private ZipFile (runs in a worker thread)"""
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for info in infos:
+            zip_ref.extract(info, extract_to)
+
 def extract_zip(zip_path, extract_to):
     """Extract ZIP file"""
     print(f"Extracting {zip_path.name}...")
+    # Directory entries are extracted here and files are grouped by folder
+    folders = {}
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_to)
+        for info in zip_ref.infolist():
+            if info.is_dir():
+                zip_ref.extract(info, extract_to)
+            else:
+                folders.setdefault(posixpath.dirname(info.filename), []).append(info)
+    
+    # ZipFile.extract creates missing parents without exist_ok, so two threads
+    # could race on a shared ancestor (e.g. "a/" and "a/b/" with no directory
+    # entries); every file's folder is created here before any thread starts.
+    # Same sanitising as ZipFile.extract: no drive, no absolute or '..' parts
+    for folder in folders:
+        parts = [p for p in os.path.splitdrive(folder.replace('\\', '/'))[1].split('/')
+                 if p not in ('', '.', '..')]
+        if parts:
+            os.makedirs(os.path.join(extract_to, *parts), exist_ok=True)
+    
+    # A ZipFile handle is not safe to share, so each thread opens its own;
+    # inflate and file writes release the GIL
+    workers = os.cpu_count() or 4
+    batches = [[] for _ in range(workers)]
+    for i, infos in enumerate(sorted(folders.values(), key=len, reverse=True)):
+        batches[i % workers].extend(infos)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(extract_members, zip_path, batch, extract_to)
+                   for batch in batches if batch]
+        for future in futures:
+            future.result()
     print("Extraction complete!")
 
+def file_contains(file_path, marker):
+    """Check whether a file contains marker bytes, without reading it into memory"""
+    if os.path.getsize(file_path) == 0:
+        return False
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(marker) != -1
+
 def rename_esp32_to_nuttyfi32(directory):
     """Rename esp32 references to nuttyfi32 in folder structure and files"""
     print("Renaming esp32 to nuttyfi32...")
@@ -73,8 +175,15 @@ def rename_esp32_to_nuttyfi32(directory):
     for file_name in files_to_update:
         file_path = directory / file_name
         if file_path.exists():
+            # Already patched by an earlier run: skip reading and rewriting it
+            marker = PATCHED_MARKERS.get(file_name)
+            if marker and file_contains(file_path, marker):
+                print(f"  Already patched: {file_name}")
+                continue
+            
             with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+                original = f.read()
+            content = original
             
             # Only replace package name references, keep architecture as esp32
             # Replace "ESP32 Arduino" with "nuttyfi32 Arduino" in package.json
@@ -96,116 +205,157 @@ def rename_esp32_to_nuttyfi32(directory):
                     "recipe.objcopy.bin.pattern.linux",
                     "tools.esptool_py.upload.pattern.linux",
                 ]
-                def replace_python_with_python3(line, key):
-                    prefix = f"{key}=python"
-                    if line.startswith(prefix):
-                        return f"{key}=python3{line[len(prefix):]}"
-                    return line
+                # One tuple startswith (a single C call) per line; only the
+                # few matching lines are rewritten
+                python_prefixes = tuple(f"{key}=python" for key in python_keys)
                 for i, line in enumerate(lines):
-                    for key in python_keys:
-                        new_line = replace_python_with_python3(line, key)
-                        if new_line != line:
-                            line = new_line
-                    lines[i] = line
+                    if line.startswith(python_prefixes):
+                        key = line[:line.index("=")]
+                        lines[i] = f"{key}=python3{line[len(key) + len('=python'):]}"
                 content = '\n'.join(lines)
             
             # In boards.txt, add nuttyfi32 board entry
             if file_name == "boards.txt":
-                lines = content.split('\n')
-                nuttyfi32_added = False
-                
-                # Find esp32.name line
-                esp32_start = None
-                esp32_end = None
-                for i, line in enumerate(lines):
-                    if line.strip() == "esp32.name=ESP32 Dev Module" and esp32_start is None:
-                        esp32_start = i
-                    elif esp32_start is not None and esp32_end is None:
-                        # Find end of esp32 section (next board that's not esp32.*)
-                        if line.strip() and not line.strip().startswith('esp32.') and not line.strip().startswith('#') and not line.strip() == '':
-                            # Check if it's a menu item continuation
-                            if not line.strip().startswith('esp32.menu.'):
-                                esp32_end = i
-                                break
-                
-                if esp32_start is not None:
-                    # Find actual end by looking for next board definition
-                    if esp32_end is None:
-                        esp32_end = len(lines)
-                        for i in range(esp32_start + 1, len(lines)):
-                            line = lines[i].strip()
-                            # Next board definition (has .name= and doesn't start with esp32.)
-                            if '.name=' in line and not line.startswith('esp32.') and not line.startswith('#'):
-                                esp32_end = i
-                                break
-                    
-                    # Extract all esp32 properties
-                    esp32_section = lines[esp32_start:esp32_end]
-                    
-                    # Create nuttyfi32 section by replacing esp32. with nuttyfi32.
-                    nuttyfi32_section = []
-                    nuttyfi32_section.append("")
-                    nuttyfi32_section.append("##############################################################")
-                    nuttyfi32_section.append("# nuttyfi32 Dev Module (same as ESP32 Dev Module)")
-                    nuttyfi32_section.append("##############################################################")
-                    nuttyfi32_section.append("")
-                    
-                    for line in esp32_section:
-                        if line.strip().startswith('esp32.'):
-                            # Replace esp32. with nuttyfi32.
-                            nuttyfi32_line = line.replace('esp32.', 'nuttyfi32.', 1)
-                            nuttyfi32_section.append(nuttyfi32_line)
-                        elif line.strip() == '' or line.strip().startswith('#'):
-                            # Keep empty lines and comments
-                            nuttyfi32_section.append(line)
-                    
+                # ESP32 Dev Module section: its name line plus every following
+                # esp32.* / comment / blank line, found in one regex pass
+                match = ESP32_BOARD_RE.search(content)
+                if match:
+                    nuttyfi32_section = "\n".join([
+                        "",
+                        "##############################################################",
+                        "# nuttyfi32 Dev Module (same as ESP32 Dev Module)",
+                        "##############################################################",
+                        "",
+                        ESP32_PREFIX_RE.sub(r"\1nuttyfi32.", match.group(0)),
+                    ])
                     # Insert nuttyfi32 section after esp32 section
-                    lines[esp32_end:esp32_end] = nuttyfi32_section
-                    nuttyfi32_added = True
+                    content = content[:match.end()] + "\n" + nuttyfi32_section + content[match.end():]
                     print(f"  Added nuttyfi32 board entry to boards.txt")
-                
-                content = '\n'.join(lines)
             
+            # Nothing to patch (e.g. package.json): leave the file alone
+            if content == original:
+                print(f"  Unchanged: {file_name}")
+                continue
+            
+            # The work copy may be a hardlink into the BSP source; write a new
+            # file instead of through the link
+            file_path.unlink()
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(content)
             print(f"  Updated: {file_name}")
 
+def scan_files(path):
+    """Yield paths of all files under path in sorted order, skipping hidden directories"""
+    # scandir order depends on the filesystem; sorting by name keeps the ZIP
+    # member order, and with it the archive bytes, the same on every machine
+    with os.scandir(path) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_dir():
+            # Like os.walk: symlinked directories are not descended into
+            if not entry.name.startswith('.') and not entry.is_symlink():
+                yield from scan_files(entry.path)
+        else:
+            yield entry.path
+
+def deflate_entry(zinfo, data):
+    """Fill in CRC and sizes of zinfo and return data DEFLATEd"""
+    # Same raw DEFLATE stream zipfile itself would produce at this level
+    compressor = zlib.compressobj(ZIP_COMPRESSLEVEL, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    zinfo.compress_size = len(compressed)
+    return compressed
+
+class HashingFile:
+    """Write-only file wrapper that SHA-256 hashes bytes as they are written"""
+    
+    def __init__(self, fp):
+        self._fp = fp
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+    
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self._fp.write(data)
+    
+    def tell(self):
+        return self.size
+    
+    def flush(self):
+        self._fp.flush()
+
+def compress_zip_entry(task):
+    """Read and DEFLATE one file for the ZIP (runs in a worker process)"""
+    file_path, arcname = task
+    # Fixed timestamp so unchanged sources give a byte-identical ZIP (and
+    # SHA-256); mode and size come from fstat on the already-open file
+    zinfo = zipfile.ZipInfo(arcname.replace(os.sep, "/"), date_time=ZIP_DATE_TIME)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    with open(file_path, "rb") as f:
+        st = os.fstat(f.fileno())
+        zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+        if st.st_size >= ZIP_MMAP_THRESHOLD:
+            # CRC-32 and DEFLATE both run in C straight over the mapped pages
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return zinfo, deflate_entry(zinfo, data)
+        data = f.read()
+    return zinfo, deflate_entry(zinfo, data)
+
+def write_compressed_entry(zipf, zinfo, compressed):
+    """Append an already-compressed member to an open ZipFile"""
+    zinfo.header_offset = zipf.fp.tell()
+    zipf.fp.write(zinfo.FileHeader())
+    zipf.fp.write(compressed)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    # Central directory is written at start_dir when the ZipFile closes
+    zipf.start_dir = zipf.fp.tell()
+
 def create_zip(source_dir, output_zip):
-    """Create ZIP file from directory"""
+    """Create ZIP file from directory, returns (SHA-256, size) of the ZIP"""
     print(f"Creating ZIP: {output_zip.name}...")
     
     # Remove old ZIP if exists
     if output_zip.exists():
         output_zip.unlink()
     
-    with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(source_dir):
-            # Skip temp directories
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                file_path = Path(root) / file
-                arcname = file_path.relative_to(source_dir)
-                zipf.write(file_path, arcname)
-                print(f"  Added: {arcname}")
+    # Arcnames are sliced off the path instead of Path.relative_to per file
+    source_prefix = str(source_dir) + os.sep
+    tasks = [(path, path[len(source_prefix):]) for path in scan_files(str(source_dir))]
+    
+    # DEFLATE runs on all CPU cores; the main process only appends the
+    # compressed members in walk order. HashingFile has no seek(), so the
+    # archive is written strictly sequentially and hashed on the way out
+    with open(output_zip, 'wb') as raw:
+        out = HashingFile(raw)
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL) as zipf:
+            with ProcessPoolExecutor() as executor:
+                for zinfo, compressed in executor.map(compress_zip_entry, tasks, chunksize=16):
+                    write_compressed_entry(zipf, zinfo, compressed)
+                    print(f"  Added: {zinfo.filename}")
     
     print(f"ZIP created: {output_zip}")
-    return output_zip
+    return out.sha256.hexdigest().upper(), out.size
 
-def update_json_with_checksum(json_file, zip_file, version):
+def update_json_with_checksum(json_file, zip_file, version, checksum=None, size=None):
     """Update JSON file with checksum and size"""
     print("Updating JSON file...")
     
-    # Calculate checksum and size
-    checksum = calculate_sha256(zip_file)
-    size = get_file_size(zip_file)
+    # Calculate checksum and size unless create_zip already streamed them
+    if checksum is None:
+        checksum = calculate_sha256(zip_file)
+    if size is None:
+        size = get_file_size(zip_file)
     
     print(f"  Checksum: SHA-256:{checksum}")
     print(f"  Size: {size} bytes")
     
     # Read JSON
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    original = json_file.read_text(encoding='utf-8')
+    data = json.loads(original)
     
     # Update platform entry
     platform = data['packages'][0]['platforms'][0]
@@ -215,12 +365,52 @@ def update_json_with_checksum(json_file, zip_file, version):
     platform['url'] = f"https://github.com/itsbhupendrasingh/nuttyfi32/releases/download/{version}/nuttyfi32-{version}.zip"
     platform['archiveFileName'] = f"nuttyfi32-{version}.zip"
     
-    # Write updated JSON
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    # Write updated JSON - serialize once (json.dump writes every token
+    # separately) and skip the write when nothing changed
+    content = json.dumps(data, indent=2)
+    if content != original:
+        json_file.write_text(content, encoding='utf-8')
     
     print(f"JSON updated: {json_file}")
 
+def calculate_source_fingerprint():
+    """Fingerprint the build input (source ZIP or BSP folder) from paths, sizes and mtimes"""
+    fingerprint = hashlib.blake2b(digest_size=16)
+    fingerprint.update(VERSION.encode())
+    if ZIP_SOURCE.exists():
+        sources = [str(ZIP_SOURCE)]
+    else:
+        sources = sorted(scan_files(str(BSP_SOURCE)))
+    for path in sources:
+        st = os.stat(path)
+        fingerprint.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\0".encode('utf-8', 'surrogateescape'))
+    return fingerprint.hexdigest()
+
+def load_build_cache(fingerprint):
+    """Return (checksum, size) of OUTPUT_ZIP if it was built from this exact source, else None"""
+    try:
+        with open(BUILD_CACHE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        zip_stat = OUTPUT_ZIP.stat()
+    except (OSError, ValueError):
+        return None
+    if (cache.get('fingerprint') != fingerprint
+            or cache.get('zip_size') != zip_stat.st_size
+            or cache.get('zip_mtime_ns') != zip_stat.st_mtime_ns):
+        return None
+    return cache['sha256'], zip_stat.st_size
+
+def save_build_cache(fingerprint, checksum):
+    """Remember which source OUTPUT_ZIP was built from"""
+    zip_stat = OUTPUT_ZIP.stat()
+    with open(BUILD_CACHE, 'w', encoding='utf-8') as f:
+        json.dump({
+            'fingerprint': fingerprint,
+            'zip_size': zip_stat.st_size,
+            'zip_mtime_ns': zip_stat.st_mtime_ns,
+            'sha256': checksum,
+        }, f)
+
 def main():
     """Main function"""
     print("=" * 60)
@@ -236,10 +426,25 @@ def main():
         print(f"  - {ZIP_SOURCE.name} file")
         return 1
     
+    # Finish deleting temp trees an earlier run left behind
+    with os.scandir(BASE_DIR) as it:
+        for entry in it:
+            if entry.name.startswith(TRASH_PREFIX) and entry.is_dir(follow_symlinks=False):
+                remove_in_background(entry.path)
+    
+    # Nothing changed since the last build: reuse the ZIP, only refresh the JSON
+    fingerprint = calculate_source_fingerprint()
+    cached = load_build_cache(fingerprint)
+    if cached:
+        print(f"Source unchanged since last build, reusing {OUTPUT_ZIP.name}")
+        checksum, size = cached
+        update_json_with_checksum(JSON_FILE, OUTPUT_ZIP, VERSION, checksum, size)
+        return 0
+    
     # Clean temp directory
     if TEMP_DIR.exists():
         print(f"Cleaning temp directory: {TEMP_DIR}")
-        shutil.rmtree(TEMP_DIR)
+        discard_dir(TEMP_DIR)
     TEMP_DIR.mkdir()
     
     try:
@@ -257,16 +462,18 @@ def main():
             # Use BSP source directly
             print(f"Using BSP source: {BSP_SOURCE}")
             work_dir = TEMP_DIR / "nuttyfi32"
-            shutil.copytree(BSP_SOURCE, work_dir)
+            # Hardlinked copy: only the few files renamed/patched get new data
+            shutil.copytree(BSP_SOURCE, work_dir, copy_function=link_or_copy)
         
         # Rename esp32 to nuttyfi32 (only package-related)
         rename_esp32_to_nuttyfi32(work_dir)
         
         # Create ZIP
-        create_zip(work_dir, OUTPUT_ZIP)
+        checksum, size = create_zip(work_dir, OUTPUT_ZIP)
+        save_build_cache(fingerprint, checksum)
         
         # Update JSON
-        update_json_with_checksum(JSON_FILE, OUTPUT_ZIP, VERSION)
+        update_json_with_checksum(JSON_FILE, OUTPUT_ZIP, VERSION, checksum, size)
         
         print()
         print("=" * 60)
@@ -292,8 +499,12 @@ def main():
         # Cleanup temp directory
         if TEMP_DIR.exists():
             print(f"Cleaning up temp directory...")
-            shutil.rmtree(TEMP_DIR)
+            discard_dir(TEMP_DIR)
 
 if __name__ == "__main__":
-    exit(main())
+    status = main()
+    # The temp trees are deleted while the build runs; finish before exiting
+    # so no renamed .trash.* copy is left behind
+    wait_for_cleanup()
+    exit(status)
 
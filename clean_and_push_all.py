@@ -69,11 +69,12 @@ def add_all_files():
     print("\nAdding ALL files to git...")
     
     files_added = []
+    to_add = []
     
     # 1. Add .gitignore first
     gitignore = BASE_DIR / ".gitignore"
     if gitignore.exists():
-        subprocess.run(["git", "add", ".gitignore"], cwd=BASE_DIR, check=False)
+        to_add.append(".gitignore")
         files_added.append(".gitignore")
     
     # 2. Add ENTIRE arduino-esp32-master folder (ALL files, ALL subfolders)
@@ -82,7 +83,7 @@ def add_all_files():
         print(f"  Adding arduino-esp32-master/ (COMPLETE - ALL files and folders)...")
         print(f"    This includes: cores/, libraries/, tools/, variants/, docs/, etc.")
         
-        # Add entire folder recursively - ALL files
+        # Add entire folder recursively - ALL files (-f: even where .gitignore matches)
         result = subprocess.run(
             ["git", "add", "-f", "arduino-esp32-master/"], 
             cwd=BASE_DIR, 
@@ -90,19 +91,6 @@ def add_all_files():
             capture_output=True,
             text=True
         )
-        
-        # Count files being added
-        file_count = 0
-        dir_count = 0
-        for root, dirs, files in os.walk(bsp_source):
-            # Skip .git and other hidden dirs
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            file_count += len([f for f in files if not f.startswith('.')])
-            dir_count += len(dirs)
-        
-        files_added.append(f"arduino-esp32-master/ ({file_count} files, {dir_count} folders - COMPLETE)")
-        print(f"  ✓ Added {file_count} files from {dir_count} folders")
-        
         if result.returncode != 0 and result.stderr:
             print(f"    Note: {result.stderr[:200]}")
     
@@ -122,11 +110,44 @@ def add_all_files():
         "clean_and_push_all.py",
     ]
     
-    for file in project_files:
-        file_path = BASE_DIR / file
-        if file_path.exists():
-            subprocess.run(["git", "add", str(file_path.relative_to(BASE_DIR))], cwd=BASE_DIR, check=False)
-            files_added.append(file)
+    project_added = [file for file in project_files if (BASE_DIR / file).exists()]
+    to_add.extend(project_added)
+    
+    # .gitignore and the project files in one git process, paths fed on stdin.
+    # No -f: .gitignore still applies to them; --ignore-errors keeps one bad
+    # path from stopping the rest, like the old per-file adds
+    if to_add:
+        subprocess.run(
+            ["git", "--literal-pathspecs", "add", "--ignore-errors",
+             "--pathspec-from-file=-", "--pathspec-file-nul"],
+            input="\0".join(to_add),
+            cwd=BASE_DIR,
+            check=False,
+            text=True
+        )
+    
+    if bsp_source.exists():
+        # Count files being added from git's index instead of walking the folder again
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--", "arduino-esp32-master/"],
+            cwd=BASE_DIR,
+            check=False,
+            capture_output=True,
+            text=True
+        )
+        paths = [path for path in result.stdout.split("\0") if path]
+        folders = set()
+        for path in paths:
+            parts = path.split("/")[1:-1]
+            for i in range(1, len(parts) + 1):
+                folders.add("/".join(parts[:i]))
+        file_count = len(paths)
+        dir_count = len(folders)
+        
+        files_added.append(f"arduino-esp32-master/ ({file_count} files, {dir_count} folders - COMPLETE)")
+        print(f"  ✓ Added {file_count} files from {dir_count} folders")
+    
+    files_added.extend(project_added)
     
     print(f"\n  ✓ Total files/folders added: {len(files_added)}")
     return files_added
@@ -154,22 +175,28 @@ def commit_and_push():
     if len(changes.split('\n')) > 20:
         print(f"    ... and {len(changes.split('\n')) - 20} more files")
     
+    # Set remote with token while the commit runs (config vs. index/refs,
+    # so the two git processes never contend for the same lock)
+    remote = subprocess.Popen(
+        ["git", "remote", "set-url", "origin", REPO_URL],
+        cwd=BASE_DIR
+    )
+    
     # Commit
     print("\nCommitting ALL files...")
-    subprocess.run(
-        ["git", "commit", "-m", "Complete nuttyfi32 BSP: All source files from arduino-esp32-master"],
-        cwd=BASE_DIR,
-        check=True
-    )
+    try:
+        subprocess.run(
+            ["git", "commit", "-m", "Complete nuttyfi32 BSP: All source files from arduino-esp32-master"],
+            cwd=BASE_DIR,
+            check=True
+        )
+    finally:
+        remote_code = remote.wait()
     print("  ✓ Committed")
     
-    # Set remote with token
     print("\nConfiguring remote with token...")
-    subprocess.run(
-        ["git", "remote", "set-url", "origin", REPO_URL],
-        cwd=BASE_DIR,
-        check=True
-    )
+    if remote_code != 0:
+        raise subprocess.CalledProcessError(remote_code, remote.args)
     print("  ✓ Remote configured")
     
     # Push